@@ -52,4 +52,14 @@ SYSTEM_METRIC_NAMES = {
 
 WIFI_CONFIG = {
     "country_code": "GB",  # 2-letter country code
+    "power_save": False,  # Radio power saving; adds latency spikes to scrapes
 }
+
+# =============================================================================
+# DIAGNOSTICS
+# =============================================================================
+
+# Echo routine status messages to the serial console. Each print blocks until
+# the USB serial link drains, so leave this off outside of bench debugging;
+# errors are always printed and everything is kept in the web log buffer.
+DEBUG = False
@@ -9,6 +9,8 @@ import json
 import time
 import os
 
+from config import DEBUG
+
 # Default configuration values
 DEFAULT_CONFIG = {
     "device": {
@@ -71,7 +73,8 @@ def load_device_config():
                 if repo_key not in config["ota"]["github_repo"]:
                     config["ota"]["github_repo"][repo_key] = DEFAULT_CONFIG["ota"]["github_repo"][repo_key]
 
-        print(f"Device config loaded: {config['device']['location']}/{config['device']['name']}")
+        if DEBUG:
+            print(f"Device config loaded: {config['device']['location']}/{config['device']['name']}")
         return config
 
     except OSError:
@@ -120,7 +123,8 @@ def save_device_config(config):
                 pass
             os.rename(temp_file, 'device_config.json')
 
-        print(f"Device config saved: {config['device']['location']}/{config['device']['name']}")
+        if DEBUG:
+            print(f"Device config saved: {config['device']['location']}/{config['device']['name']}")
         return True
 
     except Exception as e:
@@ -148,7 +152,7 @@ def format_timestamp(timestamp):
     try:
         # Simple timestamp formatting for MicroPython compatibility
         return str(int(timestamp))
-    except:
+    except (TypeError, ValueError):
         return ""
 
 
@@ -272,5 +276,6 @@ def get_ota_config():
 
 
 # Initialize configuration on module import
-print("Initializing device configuration...")
+if DEBUG:
+    print("Initializing device configuration...")
 _initial_config = load_device_config()
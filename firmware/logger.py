@@ -7,6 +7,32 @@ Designed for debugging OTA updates and system operations without disk usage.
 
 import time
 import gc
+import micropython
+
+# Bound once so each log call skips the module attribute lookup
+_time = time.time
+
+
+@micropython.native
+def _filter_logs(entries, level, category):
+    """Return entries matching level and category (None matches any) in one pass."""
+    out = []
+    for log in entries:
+        if (not level or log['l'] == level) and (not category or log['c'] == category):
+            out.append(log)
+    return out
+
+
+@micropython.native
+def _format_log_lines(logs):
+    """Render log entries as a tuple of plain text lines, each ending in a newline."""
+    lines = [None] * len(logs)
+    for i in range(len(logs)):
+        log = logs[i]
+        # Format: [+123s] ERROR OTA: Update failed
+        lines[i] = "[%6s] %-5s %-7s: %s\n" % ("+%ds" % log['t'], log['l'], log['c'], log['m'])
+
+    return tuple(lines)
 
 
 class MemoryLogger:
@@ -27,7 +53,7 @@ class MemoryLogger:
         self.entries = []
         self.max_entries = max_entries
         self.max_memory_bytes = max_memory_bytes
-        self.start_time = time.time()
+        self.start_time = int(_time())
         self.log_levels = ["DEBUG", "INFO", "WARN", "ERROR"]
         self.categories = ["SYSTEM", "OTA", "SENSOR", "CONFIG", "NETWORK", "HTTP"]
 
@@ -57,7 +83,7 @@ class MemoryLogger:
             message = message[:77] + "..."
 
         # Create efficient log entry
-        timestamp = int(time.time() - self.start_time)
+        timestamp = int(_time()) - self.start_time
         entry = {
             't': timestamp,      # Relative timestamp (seconds since boot)
             'l': level,          # Log level
@@ -125,15 +151,14 @@ class MemoryLogger:
         Returns:
             list: Filtered log entries
         """
-        filtered_logs = self.entries
-
-        # Apply level filter
-        if level_filter and level_filter != "ALL":
-            filtered_logs = [log for log in filtered_logs if log['l'] == level_filter]
+        if level_filter == "ALL":
+            level_filter = None
+        if category_filter == "ALL":
+            category_filter = None
 
-        # Apply category filter
-        if category_filter and category_filter != "ALL":
-            filtered_logs = [log for log in filtered_logs if log['c'] == category_filter]
+        filtered_logs = self.entries
+        if level_filter or category_filter:
+            filtered_logs = _filter_logs(filtered_logs, level_filter, category_filter)
 
         # Apply count limit
         if last_n and last_n > 0:
@@ -141,26 +166,31 @@ class MemoryLogger:
 
         return filtered_logs
 
-    def get_logs_as_text(self, level_filter=None, category_filter=None, last_n=None):
+    def get_log_lines(self, level_filter=None, category_filter=None, last_n=None):
         """
-        Get logs formatted as plain text.
+        Get logs formatted as plain text lines.
+
+        The web interface sends the lines as separate response parts, so the
+        log text is never joined into one large string.
 
         Returns:
-            str: Formatted log text
+            tuple: Formatted lines, each ending in a newline
         """
         logs = self.get_logs(level_filter, category_filter, last_n)
 
         if not logs:
-            return "No logs found matching criteria."
+            return ("No logs found matching criteria.\n",)
 
-        lines = []
-        for log in logs:
-            # Format: [+123s] ERROR OTA: Update failed
-            timestamp_str = f"+{log['t']}s"
-            line = f"[{timestamp_str:>6}] {log['l']:5} {log['c']:7}: {log['m']}"
-            lines.append(line)
+        return _format_log_lines(logs)
+
+    def get_logs_as_text(self, level_filter=None, category_filter=None, last_n=None):
+        """
+        Get logs formatted as plain text.
 
-        return "\n".join(lines)
+        Returns:
+            str: Formatted log text
+        """
+        return "".join(self.get_log_lines(level_filter, category_filter, last_n))[:-1]
 
     def get_statistics(self):
         """
@@ -174,7 +204,7 @@ class MemoryLogger:
             "total_logged": self.total_logs,
             "memory_usage_bytes": self._estimate_memory_usage(),
             "memory_usage_kb": round(self._estimate_memory_usage() / 1024, 1),
-            "uptime_seconds": int(time.time() - self.start_time),
+            "uptime_seconds": int(_time()) - self.start_time,
             "logs_by_level": self.logs_by_level.copy(),
             "max_entries": self.max_entries,
             "max_memory_kb": round(self.max_memory_bytes / 1024, 1)
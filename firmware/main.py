@@ -19,10 +19,16 @@ wlan.active(True)
 
 # BOOT PROTECTION: Try to import all modules with fallback to recovery mode
 try:
+    try:
+        import asyncio
+    except ImportError:
+        import uasyncio as asyncio  # MicroPython before 1.21 ships it as uasyncio
     import socket
+    import random
     import dht
     import rp2
     from machine import Pin
+    from micropython import const
     import gc
 
     from config import (
@@ -32,7 +38,6 @@ try:
         SERVER_CONFIG,
         WIFI_CONFIG,
     )
-    from device_config import get_config_for_metrics
     from logger import log_info, log_warn, log_error, log_debug
 
     # Import web interface functions
@@ -42,37 +47,56 @@ try:
         handle_config_page,
         handle_config_update,
         handle_logs_page,
+        finish_response,
+        get_query_string,
+        get_request_length,
+        get_cached_metrics_config,
+        get_cached_version,
+        H_200_HTML,
+        H_200_METRICS,
+        H_204_CACHED,
+        H_400_TEXT,
+        H_404_TEXT,
+        H_405_TEXT,
+        H_500_HTML,
+        H_500_TEXT,
+        H_503_HTML,
+        H_503_TEXT,
     )
 
     print("BOOT: All modules loaded successfully")
     RECOVERY_MODE = False
 
-except ImportError as e:
-    print(f"BOOT FAILURE: Module import failed: {e}")
-    print("ACTIVATING RECOVERY MODE...")
-    RECOVERY_MODE = True
-
-    # Execute recovery mode
-    exec(open('recovery.py').read())
-    # Recovery mode runs its own server loop, so we exit here
-    exit()
-
 except Exception as e:
-    print(f"BOOT FAILURE: Unexpected error: {e}")
+    if isinstance(e, ImportError):
+        print(f"BOOT FAILURE: Module import failed: {e}")
+    else:
+        print(f"BOOT FAILURE: Unexpected error: {e}")
     print("ACTIVATING RECOVERY MODE...")
     RECOVERY_MODE = True
 
-    # Execute recovery mode
-    exec(open('recovery.py').read())
+    # Execute recovery mode (filesystem copy, or the frozen one if missing)
+    import recovery
     # Recovery mode runs its own server loop, so we exit here
     exit()
 
-# Record boot time using ticks for accurate uptime calculation
+# Record boot time using ticks for accurate uptime calculation. Uptime is
+# accumulated from tick deltas, so it keeps counting past the ticks_ms wrap
+# (2^30 ms) as long as it is sampled at least every few days.
 boot_ticks = time.ticks_ms()
+_uptime = {"ticks": boot_ticks, "ms": 0}
 
 # Simplified update tracking - no complex status
 update_in_progress = False
 
+# Receive buffer reused for every request instead of allocating per connection
+_REQBUF = bytearray(2048)
+_REQMV = memoryview(_REQBUF)
+
+# Send buffer sized to one TCP segment; response parts are packed into it
+_SENDBUF = bytearray(1460)
+_SENDMV = memoryview(_SENDBUF)
+
 # Wi-Fi Setup with safety checks
 try:
     ssid = secrets["ssid"]
@@ -94,35 +118,80 @@ except Exception as e:
 
 rp2.country(WIFI_CONFIG["country_code"])
 
+# Keep the radio awake between beacons so requests are answered without waiting
+# for it to wake up (0xa11140 is the CYW43 "no power save" setting)
+if not WIFI_CONFIG.get("power_save", False):
+    try:
+        wlan.config(pm=getattr(network.WLAN, "PM_NONE", 0xa11140))
+    except Exception as e:
+        log_warn(f"Could not disable WiFi power saving: {e}", "NETWORK")
+
+# Reconnect delays grow from 0.5 s up to 30 s; each wait is a random time
+# below the current cap, so stations failing together do not retry together
+_WIFI_BACKOFF_BASE_MS = const(500)
+_WIFI_BACKOFF_MAX_MS = const(30000)
+
+# wlan.status() once joined with an address (network.STAT_GOT_IP)
+_WIFI_CONNECTED = const(3)
+
+# Link state poll interval, and how long one join attempt may take
+_WIFI_POLL_MS = const(250)
+_WIFI_TIMEOUT_MS = const(20000)
+
+
+def wifi_backoff_ms(attempt):
+    """
+    Pick a full-jitter backoff delay for a WiFi reconnect attempt.
+
+    Args:
+        attempt (int): Number of failed attempts so far, starting at 0.
+
+    Returns:
+        int: Delay in milliseconds, between 0 and the cap for this attempt.
+    """
+    cap = min(_WIFI_BACKOFF_MAX_MS, _WIFI_BACKOFF_BASE_MS << min(attempt, 6))
+    return random.getrandbits(16) % cap
+
+
 def connect_wifi():
     """
     Connect to WiFi with improved error handling and retry logic.
 
+    The link state is polled every _WIFI_POLL_MS, so boot continues as soon
+    as an address is assigned rather than on the next whole second.
+
     Returns:
         bool: True if connected successfully, False otherwise.
     """
     log_info("Connecting to Wi-Fi...", "NETWORK")
     wlan.connect(ssid, password)
 
-    max_wait = 20  # Increased timeout
-    while max_wait > 0:
+    retry = 0
+    last_status = None
+    deadline = time.ticks_add(time.ticks_ms(), _WIFI_TIMEOUT_MS)
+    while time.ticks_diff(deadline, time.ticks_ms()) > 0:
         status = wlan.status()
 
-        if status == 3:  # Connected
+        if status == _WIFI_CONNECTED:
             ip = wlan.ifconfig()[0]
             log_info(f"WiFi connected, IP: {ip}", "NETWORK")
             return True
         elif status < 0:  # Error states (-1, -2, -3)
-            log_warn(f"Connection failed with status {status}, retrying...", "NETWORK")
+            delay = wifi_backoff_ms(retry)
+            retry += 1
+            log_warn(f"Connection failed with status {status}, retrying in {delay} ms", "NETWORK")
             wlan.disconnect()
-            time.sleep(2)
+            time.sleep_ms(delay)
             wlan.connect(ssid, password)
-            max_wait = 20  # Reset timeout for retry
-        else:
-            log_debug(f"Connecting... (status: {status}, {max_wait}s remaining)", "NETWORK")
+            # Reset timeout for retry
+            deadline = time.ticks_add(time.ticks_ms(), _WIFI_TIMEOUT_MS)
+        elif status != last_status:
+            # Failed joins pass through JOIN/NOIP too, so the backoff is only
+            # cleared by returning connected, never by these interim states
+            log_debug(f"Connecting... (status: {status})", "NETWORK")
 
-        max_wait -= 1
-        time.sleep(1)
+        last_status = status
+        time.sleep_ms(_WIFI_POLL_MS)
 
     # If we get here, connection failed
     log_error("WiFi connection timeout", "NETWORK")
@@ -132,7 +201,7 @@ def connect_wifi():
 # Connect with improved reliability
 if not connect_wifi():
     log_error("Initial connection failed, trying once more...", "NETWORK")
-    time.sleep(5)
+    time.sleep_ms(wifi_backoff_ms(4))
     if not connect_wifi():
         log_error("Wi-Fi connection failed after retries", "NETWORK")
         raise RuntimeError("Wi-Fi connection failed after retries")
@@ -158,118 +227,167 @@ except Exception as e:
     log_error(f"Failed to initialize OTA updater: {e}", "OTA")
 
 
+# The DHT22 needs 2 s between measurements. A background task measures at
+# that pace and requests only ever read the stored result, so a scrape never
+# waits on the sensor's wire protocol.
+_DHT_MIN_INTERVAL_MS = const(2000)
+_NO_READING = (None, None)
+_last_reading = {"values": _NO_READING, "failed": False}
+
+
 def read_dht22():
     """
-    Read temperature and humidity from the DHT22 sensor.
+    Return the latest temperature and humidity measured by sensor_loop.
 
     Returns:
-        tuple: A tuple containing (temperature, humidity) as floats rounded to 2 decimal places,
-               or (None, None) if the sensor reading fails.
+        tuple: A tuple containing (temperature, humidity) as floats at the sensor's
+               0.1 resolution, or (None, None) if the last measurement failed.
+    """
+    return _last_reading["values"]
+
+
+def measure_dht22():
+    """
+    Take one DHT22 measurement and store it for read_dht22.
     """
     try:
         sensor.measure()
-        t = sensor.temperature()
-        h = sensor.humidity()
         # Removed verbose sensor reading logs to save log space
-        return round(t, 2), round(h, 2)
+        # The driver already reports one decimal place, so no rounding is needed
+        _last_reading["values"] = (sensor.temperature(), sensor.humidity())
+        _last_reading["failed"] = False
     except Exception as e:
-        log_error(f"Sensor read failed: {e}", "SENSOR")
-        return None, None
+        _last_reading["values"] = _NO_READING
+        # Log once per outage rather than every two seconds
+        if not _last_reading["failed"]:
+            log_error(f"Sensor read failed: {e}", "SENSOR")
+        _last_reading["failed"] = True
 
 
-def format_metrics(temperature, humidity):
+async def sensor_loop():
     """
-    Format temperature, humidity, and system health as Prometheus metrics with dynamic labels.
+    Measure the DHT22 as often as it allows, for as long as the server runs.
+    """
+    while True:
+        measure_dht22()
+        await asyncio.sleep_ms(_DHT_MIN_INTERVAL_MS)
+
+
+def get_uptime_seconds():
+    """
+    Get whole seconds since boot using integer tick arithmetic only.
+
+    Returns:
+        int: Uptime in seconds.
+    """
+    now = time.ticks_ms()
+    _uptime["ms"] += time.ticks_diff(now, _uptime["ticks"])
+    _uptime["ticks"] = now
+    return _uptime["ms"] // 1000
+
+
+# Metrics exposition template, with labels and HELP/TYPE lines baked in and
+# %-holes for the per-scrape values; rebuilt only when the label config
+# changes. The version is read once per build: it only changes through an OTA
+# update, and that always ends in a reboot.
+_metrics_cache = {"config": None, "template": None}
+
+# Metric names are fixed at import, so they are looked up once here
+_TEMPERATURE_NAME = METRIC_NAMES["temperature"]
+_HUMIDITY_NAME = METRIC_NAMES["humidity"]
+
+
+def _build_metrics_template(config, version):
+    """
+    Build the bytes template that a scrape fills with a single %-format.
 
     Args:
-        temperature (float): Temperature reading in Celsius.
-        humidity (float): Humidity reading as a percentage.
+        config (dict): Metrics label config (location and device).
+        version (str): Current firmware version, used when OTA is enabled.
 
     Returns:
-        str: Formatted Prometheus metrics string with HELP and TYPE comments and dynamic labels.
-    """
-    # Get device configuration for labels
-    config = get_config_for_metrics()
-    location = config["location"]
-    device = config["device"]
-
-    # Create label string for metrics
-    labels = f'{{location="{location}",device="{device}"}}'
-
-    # Basic sensor metrics with labels
-    metrics = []
-
-    # Temperature and humidity with dynamic labels
-    metrics.extend([
-        f"# HELP {METRIC_NAMES['temperature']} Temperature in Celsius",
-        f"# TYPE {METRIC_NAMES['temperature']} gauge",
-        f"{METRIC_NAMES['temperature']}{labels} {temperature}",
-        f"# HELP {METRIC_NAMES['humidity']} Humidity in Percent",
-        f"# TYPE {METRIC_NAMES['humidity']} gauge",
-        f"{METRIC_NAMES['humidity']}{labels} {humidity}",
-    ])
-
-    # System health metrics with labels
-    sensor_status = 1 if temperature is not None else 0
-    ota_status = 1 if ota_updater else 0
-
-    metrics.extend([
-        "# HELP pico_sensor_status Sensor health status (1=OK, 0=FAIL)",
-        "# TYPE pico_sensor_status gauge",
-        f"pico_sensor_status{labels} {sensor_status}",
-        "# HELP pico_ota_status OTA system status (1=enabled, 0=disabled)",
-        "# TYPE pico_ota_status gauge",
-        f"pico_ota_status{labels} {ota_status}",
-    ])
-
-    # Version information with labels
+        bytes: Exposition text with %.1f holes for temperature and humidity
+            and %d holes for sensor status and uptime.
+    """
+    # Labels and version are user-controlled, so any % in them is escaped
+    labels = ('{location="%s",device="%s"}' % (config["location"], config["device"])).replace("%", "%%")
+    version = str(version).replace("%", "%%")
+
+    # OTA status and version do not change between scrapes
+    version_info = ""
     if ota_updater:
-        current_version = ota_updater.get_current_version()
-        version_labels = f'{{location="{location}",device="{device}",version="{current_version}"}}'
-        metrics.extend([
-            "# HELP pico_version_info Current firmware version",
-            "# TYPE pico_version_info gauge",
-            f"pico_version_info{version_labels} 1",
-        ])
+        version_info = (
+            "# HELP pico_version_info Current firmware version\n"
+            "# TYPE pico_version_info gauge\n"
+            "pico_version_info%s,version=\"%s\"} 1\n" % (labels[:-1], version)
+        )
+
+    template = (
+        "# HELP %s Temperature in Celsius\n"
+        "# TYPE %s gauge\n"
+        "%s%s %%.1f\n"
+        "# HELP %s Humidity in Percent\n"
+        "# TYPE %s gauge\n"
+        "%s%s %%.1f\n"
+        "# HELP pico_sensor_status Sensor health status (1=OK, 0=FAIL)\n"
+        "# TYPE pico_sensor_status gauge\n"
+        "pico_sensor_status%s %%d\n"
+        "# HELP pico_ota_status OTA system status (1=enabled, 0=disabled)\n"
+        "# TYPE pico_ota_status gauge\n"
+        "pico_ota_status%s %d\n"
+        "%s"
+        "# HELP pico_uptime_seconds Actual uptime in seconds since boot\n"
+        "# TYPE pico_uptime_seconds counter\n"
+        "pico_uptime_seconds%s %%d\n"
+    ) % (
+        _TEMPERATURE_NAME, _TEMPERATURE_NAME, _TEMPERATURE_NAME, labels,
+        _HUMIDITY_NAME, _HUMIDITY_NAME, _HUMIDITY_NAME, labels,
+        labels,
+        labels, 1 if ota_updater else 0,
+        version_info,
+        labels,
+    )
+    return template.encode()
 
-    # System uptime (actual time since boot using ticks) with labels
-    uptime_ms = time.ticks_diff(time.ticks_ms(), boot_ticks)
 
-    # Handle potential negative values from tick wraparound
-    if uptime_ms < 0:
-        # If negative, likely due to tick counter wraparound (every ~12.4 days)
-        # Calculate using the wraparound period (2^30 ms for MicroPython)
-        uptime_ms = uptime_ms + (1 << 30)
+def format_metrics(temperature, humidity):
+    """
+    Format temperature, humidity, and system health as Prometheus metrics with dynamic labels.
+
+    Args:
+        temperature (float): Temperature reading in Celsius.
+        humidity (float): Humidity reading as a percentage.
 
-    uptime_seconds = max(0, uptime_ms // 1000)  # Ensure non-negative
-    metrics.extend([
-        "# HELP pico_uptime_seconds Actual uptime in seconds since boot",
-        "# TYPE pico_uptime_seconds counter",
-        f"pico_uptime_seconds{labels} {uptime_seconds}",
-    ])
+    Returns:
+        bytes: Complete exposition text, produced by one %-format of the
+            cached template.
+    """
+    # The config lookup is cached, so an unchanged config returns the same dict
+    config = get_cached_metrics_config()
+    if config is not _metrics_cache["config"]:
+        _metrics_cache["template"] = _build_metrics_template(config, get_cached_version(ota_updater))
+        _metrics_cache["config"] = config
 
-    return "\n".join(metrics) + "\n"
+    # Only called with a good reading, so the sensor status is always 1 here
+    return _metrics_cache["template"] % (temperature, humidity, 1, get_uptime_seconds())
 
 
 def get_system_info():
     """Get system information for web interface."""
     # WiFi information
-    wifi_status = "Connected" if wlan.isconnected() else "Disconnected"
-    wifi_class = "status-ok" if wlan.isconnected() else "status-error"
-    ip_address = wlan.ifconfig()[0] if wlan.isconnected() else "N/A"
+    connected = wlan.isconnected()
+    wifi_status = "Connected" if connected else "Disconnected"
+    wifi_class = "status-ok" if connected else "status-error"
+    ip_address = wlan.ifconfig()[0] if connected else "N/A"
 
     # System uptime
-    uptime_ms = time.ticks_diff(time.ticks_ms(), boot_ticks)
-    if uptime_ms < 0:
-        uptime_ms = uptime_ms + (1 << 30)
-    uptime_seconds = max(0, uptime_ms // 1000)
+    uptime_seconds = get_uptime_seconds()
     uptime_hours = uptime_seconds // 3600
     uptime_minutes = (uptime_seconds % 3600) // 60
     uptime_days = uptime_hours // 24
     uptime_hours = uptime_hours % 24
 
-    # Memory information
-    gc.collect()
+    # Memory information (the heap was collected after the previous response)
     free_memory = gc.mem_free()
     memory_mb = round(free_memory / 1024, 1)
     memory_class = "status-ok" if free_memory > 100000 else "status-warn" if free_memory > 50000 else "status-error"
@@ -283,22 +401,70 @@ def get_system_info():
     }
 
 
+# Fixed pages for the update and reboot endpoints; encoded together with their
+# headers into _RESP_* constants below, so sending them allocates nothing
+_OTA_DISABLED_PAGE = b"<!DOCTYPE html><html><head><title>OTA Not Enabled</title></head><body><h1>OTA NOT ENABLED</h1><p>Over-the-air updates are disabled.</p><p><a href='/config'>Enable in configuration</a> | <a href='/'>Return home</a></p></body></html>"
+_UPDATE_RUNNING_PAGE = b"<!DOCTYPE html><html><head><title>Update In Progress</title></head><body><h1>UPDATE IN PROGRESS</h1><p>An update is already running.<br>Device will restart automatically when complete.</p><p><a href='/health?update=true'>Monitor progress</a></p></body></html>"
+_REPO_NOT_FOUND_PAGE = b"<!DOCTYPE html><html><head><title>Repository Not Found</title></head><body><h1>REPOSITORY NOT FOUND</h1><p>The configured repository could not be found. Please check your repository settings.</p><p><a href='/config'>Update Configuration</a> | <a href='/'>Return home</a></p></body></html>"
+_NO_UPDATES_PAGE = b"<!DOCTYPE html><html><head><title>No Updates</title></head><body><h1>NO UPDATES AVAILABLE</h1><p>Current version is up to date.</p><p><a href='/health'>View system status</a> | <a href='/'>Return home</a></p></body></html>"
+_REBOOT_PAGE = b"""<!DOCTYPE html><html><head><title>Rebooting Device</title></head><body>
+<h1>DEVICE REBOOT INITIATED</h1>
+
+<h2>Reboot Status</h2>
+<p><strong>Status:</strong> Device will restart in 3 seconds...<br>
+<strong>Expected downtime:</strong> 10-15 seconds<br>
+<strong>Reconnection:</strong> Device will reconnect to WiFi automatically</p>
+
+<h2>Important</h2>
+<p>&bull; Device will be temporarily unavailable<br>
+&bull; All current connections will be lost<br>
+&bull; Refresh this page after 15 seconds to reconnect</p>
+
+<h2>Links</h2>
+<p><a href="/">Return to Dashboard</a> (available after reboot)</p>
+</body></html>"""
+
+# Failure pages: a constant head and tail around the error text
+_UPDATE_FAILED_HEAD = b"<!DOCTYPE html><html><head><title>Update Failed</title></head><body><h1>UPDATE FAILED</h1><p>Error: "
+_REBOOT_FAILED_HEAD = b"<!DOCTYPE html><html><head><title>Reboot Failed</title></head><body><h1>REBOOT FAILED</h1><p>Error: "
+_ERROR_PAGE_TAIL = b"</p><p><a href='/'>Return home</a></p></body></html>"
+
+# Update confirmation page, filled with a single %-format call. MicroPython's
+# str has no format_map, but %-formatting with a dict runs entirely in C.
+_UPDATE_STARTED_TMPL = """<!DOCTYPE html><html><head><title>Update Started</title></head><body>
+<h1>UPDATE STARTED SUCCESSFULLY</h1>
+
+<h2>Update Details</h2>
+<p><strong>Current Version:</strong> %(current)s<br>
+<strong>Target Version:</strong> %(target)s<br>
+<strong>Status:</strong> Downloading and applying update...</p>
+
+<h2>Important</h2>
+<p>- Device will restart automatically in 1-2 minutes<br>
+- DO NOT power off the device during update<br>
+- You may lose connection temporarily during restart</p>
+
+<h2>Links</h2>
+<p><a href="/health?update=true">Monitor progress</a> | <a href="/">Dashboard</a></p>
+</body></html>"""
+
+
 def handle_update_request():
     """
     Handle OTA update request with immediate execution - minimal HTML with links.
 
     Returns:
-        str: HTTP response for update request.
+        tuple|bytes: (header, body) or prebuilt HTTP response for update request.
     """
     global update_in_progress
 
     if not ota_updater:
         log_warn("OTA update requested but OTA not enabled", "OTA")
-        return "HTTP/1.0 503 Service Unavailable\r\nContent-Type: text/html\r\n\r\n<!DOCTYPE html><html><head><title>OTA Not Enabled</title></head><body><h1>OTA NOT ENABLED</h1><p>Over-the-air updates are disabled.</p><p><a href='/config'>Enable in configuration</a> | <a href='/'>Return home</a></p></body></html>"
+        return _RESP_OTA_DISABLED
 
     if update_in_progress:
         log_info("Update already in progress", "OTA")
-        return "HTTP/1.0 200 OK\r\nContent-Type: text/html\r\n\r\n<!DOCTYPE html><html><head><title>Update In Progress</title></head><body><h1>UPDATE IN PROGRESS</h1><p>An update is already running.<br>Device will restart automatically when complete.</p><p><a href='/health?update=true'>Monitor progress</a></p></body></html>"
+        return _RESP_UPDATE_RUNNING
 
     try:
         log_info("Manual update requested", "OTA")
@@ -309,10 +475,10 @@ def handle_update_request():
         if not has_update:
             if error_info == "REPO_NOT_FOUND":
                 log_error("Repository not found", "OTA")
-                return "HTTP/1.0 200 OK\r\nContent-Type: text/html\r\n\r\n<!DOCTYPE html><html><head><title>Repository Not Found</title></head><body><h1>REPOSITORY NOT FOUND</h1><p>The configured repository could not be found. Please check your repository settings.</p><p><a href='/config'>Update Configuration</a> | <a href='/'>Return home</a></p></body></html>"
+                return _RESP_REPO_NOT_FOUND
             else:
                 log_info("No updates available", "OTA")
-                return "HTTP/1.0 200 OK\r\nContent-Type: text/html\r\n\r\n<!DOCTYPE html><html><head><title>No Updates</title></head><body><h1>NO UPDATES AVAILABLE</h1><p>Current version is up to date.</p><p><a href='/health'>View system status</a> | <a href='/'>Return home</a></p></body></html>"
+                return _RESP_NO_UPDATES
 
         # Get current version for display
         current_version = ota_updater.get_current_version()
@@ -323,30 +489,15 @@ def handle_update_request():
         log_info(f"Starting immediate update: {current_version} -> {new_version}", "OTA")
 
         # Return minimal HTML response with links
-        update_html = f"""<!DOCTYPE html><html><head><title>Update Started</title></head><body>
-<h1>UPDATE STARTED SUCCESSFULLY</h1>
-
-<h2>Update Details</h2>
-<p><strong>Current Version:</strong> {current_version}<br>
-<strong>Target Version:</strong> {new_version}<br>
-<strong>Status:</strong> Downloading and applying update...</p>
-
-<h2>Important</h2>
-<p>- Device will restart automatically in 1-2 minutes<br>
-- DO NOT power off the device during update<br>
-- You may lose connection temporarily during restart</p>
-
-<h2>Links</h2>
-<p><a href="/health?update=true">Monitor progress</a> | <a href="/">Dashboard</a></p>
-</body></html>"""
+        update_html = _UPDATE_STARTED_TMPL % {"current": current_version, "target": new_version}
 
         # Start update in background (will happen after response is sent)
-        return f"HTTP/1.0 200 OK\r\nContent-Type: text/html\r\n\r\n{update_html}"
+        return H_200_HTML, update_html
 
     except Exception as e:
         update_in_progress = False
         log_error(f"Update request failed: {e}", "OTA")
-        return f"HTTP/1.0 500 Internal Server Error\r\nContent-Type: text/html\r\n\r\n<!DOCTYPE html><html><head><title>Update Failed</title></head><body><h1>UPDATE FAILED</h1><p>Error: {e}</p><p><a href='/'>Return home</a></p></body></html>"
+        return H_500_HTML, (_UPDATE_FAILED_HEAD, str(e), _ERROR_PAGE_TAIL)
 
 
 def handle_reboot_request():
@@ -354,29 +505,11 @@ def handle_reboot_request():
     Handle manual reboot request with confirmation page.
 
     Returns:
-        str: HTTP response for reboot request.
+        tuple|bytes: (header, body) or prebuilt HTTP response for reboot request.
     """
     try:
         log_info("Manual reboot requested", "SYSTEM")
 
-        # Return confirmation page with delayed reboot
-        reboot_html = """<!DOCTYPE html><html><head><title>Rebooting Device</title></head><body>
-<h1>DEVICE REBOOT INITIATED</h1>
-
-<h2>Reboot Status</h2>
-<p><strong>Status:</strong> Device will restart in 3 seconds...<br>
-<strong>Expected downtime:</strong> 10-15 seconds<br>
-<strong>Reconnection:</strong> Device will reconnect to WiFi automatically</p>
-
-<h2>Important</h2>
-<p>• Device will be temporarily unavailable<br>
-• All current connections will be lost<br>
-• Refresh this page after 15 seconds to reconnect</p>
-
-<h2>Links</h2>
-<p><a href="/">Return to Dashboard</a> (available after reboot)</p>
-</body></html>"""
-
         # Schedule reboot after response is sent
         import _thread
         def delayed_reboot():
@@ -387,20 +520,25 @@ def handle_reboot_request():
 
         try:
             _thread.start_new_thread(delayed_reboot, ())
-        except:
+        except (OSError, RuntimeError):
             # Fallback if threading not available
             pass
 
-        return f"HTTP/1.0 200 OK\r\nContent-Type: text/html\r\n\r\n{reboot_html}"
+        return _RESP_REBOOT
 
     except Exception as e:
         log_error(f"Reboot request failed: {e}", "SYSTEM")
-        return f"HTTP/1.0 500 Internal Server Error\r\nContent-Type: text/html\r\n\r\n<!DOCTYPE html><html><head><title>Reboot Failed</title></head><body><h1>REBOOT FAILED</h1><p>Error: {e}</p><p><a href='/'>Return home</a></p></body></html>"
+        return H_500_HTML, (_REBOOT_FAILED_HEAD, str(e), _ERROR_PAGE_TAIL)
 
 
-def perform_immediate_update():
+async def perform_immediate_update():
     """
     Perform immediate OTA update with ultra-aggressive memory management.
+
+    The update check, download and apply each run synchronously and hold the
+    event loop while they work. The task yields between those stages and
+    awaits the final pause before the restart, so requests waiting on the
+    server (e.g. /health) are answered in those gaps, not during a stage.
     """
     global update_in_progress
 
@@ -422,6 +560,7 @@ def perform_immediate_update():
         # Clear variables immediately
         has_update = None
         gc.collect()
+        await asyncio.sleep(0)  # Let waiting clients in before the next stage
 
         log_info("Starting staged download...", "OTA")
 
@@ -440,6 +579,7 @@ def perform_immediate_update():
         # Clear download variables
         download_success = None
         gc.collect()
+        await asyncio.sleep(0)  # Let waiting clients in before the next stage
 
         log_info("Applying staged update...", "OTA")
 
@@ -459,7 +599,7 @@ def perform_immediate_update():
             new_version = None
             gc.collect()
 
-            time.sleep(2)
+            await asyncio.sleep(2)
 
             # Device will restart here
             import machine
@@ -476,174 +616,467 @@ def perform_immediate_update():
 
 
 # HTTP Server Setup and Request Handling
-def handle_request(cl, request):
+# Closes the open header block of every response. HTTP/1.1 connections stay
+# open by default, so Connection: close is only added to the last response
+# before handle_client closes one.
+_CONTENT_LENGTH = b"Content-Length: %d\r\n\r\n"
+_CONNECTION_CLOSE = b"Connection: close\r\n"
+
+# Idle time allowed between requests on a kept-alive connection, and for the
+# first request of a new one
+_KEEP_ALIVE_IDLE_S = const(5)
+_FIRST_REQUEST_TIMEOUT_S = const(10)
+
+
+def _buffer_part(cl, part, used):
+    """
+    Append one response part to the send buffer, flushing it when full.
+
+    Args:
+        cl: Client connection stream.
+        part (bytes): Part to send.
+        used (int): Bytes already waiting in the send buffer.
+
+    Returns:
+        int: Bytes waiting in the send buffer after this part.
+    """
+    size = len(part)
+    if used + size > len(_SENDBUF):
+        if used:
+            cl.write(_SENDMV[:used])
+            used = 0
+        if size > len(_SENDBUF):
+            # Too big to buffer, send it straight from its own memory
+            cl.write(part)
+            return 0
+    _SENDMV[used:used + size] = part
+    return used + size
+
+
+def send_response(cl, response, close=False):
+    """
+    Send a handler response to the client.
+
+    Header and body parts are packed into one reused segment-sized buffer,
+    so a typical page leaves in one or two writes without ever being joined
+    into a new string. Stream writes copy whatever the socket does not take
+    at once, so the buffer is free for reuse as soon as write() returns.
+
+    The body length is known up front, so the response carries a
+    Content-Length and the client can tell where it ends without waiting for
+    the connection to close.
+
+    Args:
+        cl: Client connection stream.
+        response (tuple|bytes): (header, body) pair; header is a precompiled bytes constant.
+            body is a str/bytes, or a tuple of parts sent in order so large pages
+            are never concatenated into one string. A complete response from
+            prebuild_response is written as is.
+        close (bool): Announce that the connection closes after this response.
+    """
+    if isinstance(response, bytes):
+        if not close:
+            cl.write(response)
+            return
+        # Slot the header in just before the blank line, without copying
+        split = response.find(b"\r\n\r\n") + 2
+        response = memoryview(response)
+        cl.write(response[:split])
+        cl.write(_CONNECTION_CLOSE)
+        cl.write(response[split:])
+        return
+
+    header, body = response
+    if not isinstance(body, tuple):
+        body = (body,)
+    # Content-Length counts bytes, so str parts are encoded before measuring
+    body = [part.encode() if isinstance(part, str) else part for part in body]
+    length = 0
+    for part in body:
+        length += len(part)
+
+    used = _buffer_part(cl, header, 0)
+    if close:
+        used = _buffer_part(cl, _CONNECTION_CLOSE, used)
+    used = _buffer_part(cl, _CONTENT_LENGTH % length, used)
+    for part in body:
+        used = _buffer_part(cl, part, used)
+    if used:
+        cl.write(_SENDMV[:used])
+
+
+def prebuild_response(header, body):
+    """
+    Encode a complete response, headers included, once ahead of sending it.
+
+    Args:
+        header (bytes): Precompiled header constant.
+        body (bytes): Response body.
+
+    Returns:
+        bytes: Response that send_response writes in a single call.
+    """
+    return header + _CONTENT_LENGTH % len(body) + body
+
+
+# Fixed responses, encoded once at import so sending them builds nothing
+_RESP_BAD_REQUEST = prebuild_response(H_400_TEXT, b"")
+_RESP_SENSOR_UNAVAILABLE = prebuild_response(H_503_TEXT, b"Sensor unavailable")
+_RESP_NOT_FOUND = prebuild_response(H_404_TEXT, b"Endpoint not found")
+_RESP_SERVER_ERROR = prebuild_response(H_500_TEXT, b"Internal server error")
+_RESP_OTA_DISABLED = prebuild_response(H_503_HTML, _OTA_DISABLED_PAGE)
+_RESP_UPDATE_RUNNING = prebuild_response(H_200_HTML, _UPDATE_RUNNING_PAGE)
+_RESP_REPO_NOT_FOUND = prebuild_response(H_200_HTML, _REPO_NOT_FOUND_PAGE)
+_RESP_NO_UPDATES = prebuild_response(H_200_HTML, _NO_UPDATES_PAGE)
+_RESP_REBOOT = prebuild_response(H_200_HTML, _REBOOT_PAGE)
+# A 204 has no body and must not carry Content-Length, so its header block is
+# just closed rather than going through prebuild_response
+_RESP_FAVICON = H_204_CACHED + b"\r\n"
+# Only the prebuilt copies are kept
+del _OTA_DISABLED_PAGE, _UPDATE_RUNNING_PAGE, _REPO_NOT_FOUND_PAGE, _NO_UPDATES_PAGE, _REBOOT_PAGE
+
+
+# Last /metrics response, reused until sensor_loop stores a new reading (every
+# _DHT_MIN_INTERVAL_MS), so scrapes landing inside that window are answered
+# without formatting anything
+_metrics_response = {"reading": None, "response": None}
+
+
+def serve_metrics(request):
+    """Prometheus metrics endpoint."""
+    reading = read_dht22()
+    if reading is _metrics_response["reading"]:
+        return _metrics_response["response"]
+
+    temp, hum = reading
+    if temp is not None and hum is not None:
+        _metrics_response["reading"] = reading
+        _metrics_response["response"] = prebuild_response(H_200_METRICS, format_metrics(temp, hum))
+        return _metrics_response["response"]
+    return _RESP_SENSOR_UNAVAILABLE
+
+
+# Health page, encoded once and reused for _HEALTH_TTL_MS; monitors polling it
+# every few seconds then cost one write instead of rebuilding the report
+_HEALTH_TTL_MS = const(10000)
+_health_response = {"ticks": 0, "response": None}
+
+
+def serve_health(request):
+    """Health check endpoint."""
+    # Progress checks (/health?update=true) and pages shown during an update
+    # are always built fresh, so they never show a report from before it
+    fresh = update_in_progress or get_query_string(request)
+
+    now = time.ticks_ms()
+    if (
+        not fresh
+        and _health_response["response"] is not None
+        and time.ticks_diff(now, _health_response["ticks"]) < _HEALTH_TTL_MS
+    ):
+        return _health_response["response"]
+
+    header, body = handle_health_check(read_dht22(), get_system_info(), ota_updater, ssid)
+    if header is not H_200_HTML:
+        return header, body  # Errors are never cached
+    if fresh:
+        return header, body
+
+    _health_response["response"] = prebuild_response(header, body)
+    _health_response["ticks"] = now
+    return _health_response["response"]
+
+
+def serve_root(request):
+    """Root endpoint - dashboard interface."""
+    return handle_root_page(read_dht22(), get_system_info(), ota_updater)
+
+
+def serve_favicon(request):
+    """No icon, but let the browser cache that answer."""
+    return _RESP_FAVICON
+
+
+# Route table: (method, path) as bytes from the request line -> function
+# taking the raw request and returning a (header, body) or prebuilt response
+ROUTES = {
+    (b"GET", METRICS_ENDPOINT.encode()): serve_metrics,
+    (b"GET", b"/health"): serve_health,
+    (b"GET", b"/config"): lambda request: handle_config_page(),
+    (b"POST", b"/config"): lambda request: handle_config_update(request, ota_updater),
+    (b"GET", b"/logs"): handle_logs_page,
+    (b"GET", b"/update"): lambda request: handle_update_request(),
+    (b"GET", b"/reboot"): lambda request: handle_reboot_request(),
+    (b"GET", b"/"): serve_root,
+    (b"GET", b"/favicon.ico"): serve_favicon,
+}
+
+# 405 response for every routed path, listing the methods it accepts in the
+# Allow header; a path missing here is answered with 404 instead
+_allowed = {}
+for _method, _path in ROUTES:
+    _allowed[_path] = _allowed.get(_path, ()) + (_method,)
+_RESP_METHOD_NOT_ALLOWED = {
+    path: prebuild_response(H_405_TEXT + b"Allow: " + b", ".join(methods) + b"\r\n", b"Method not allowed")
+    for path, methods in _allowed.items()
+}
+del _allowed, _method, _path
+
+# Request line start of a plain Prometheus scrape, matched before any parsing
+_METRICS_REQUEST_PREFIX = b"GET " + METRICS_ENDPOINT.encode() + b" "
+
+
+def handle_request(cl, request, close=False):
     """
     Handle incoming HTTP requests with improved routing and error handling.
 
     Args:
-        cl: Client socket connection.
+        cl: Client connection stream.
         request (bytes): Raw HTTP request data.
+        close (bool): The connection closes after this response.
     """
     try:
-        # Parse request
-        request_str = request.decode('utf-8')
-        lines = request_str.split('\r\n')
-        if not lines:
-            cl.send("HTTP/1.0 400 Bad Request\r\n\r\n")
+        # Scrapes are most of the traffic; their request line needs no parsing
+        if request.startswith(_METRICS_REQUEST_PREFIX):
+            send_response(cl, serve_metrics(request), close)
             return
 
-        # Extract method and path
-        request_line = lines[0]
-        parts = request_line.split(' ')
-        if len(parts) < 2:
-            cl.send("HTTP/1.0 400 Bad Request\r\n\r\n")
+        # Parse only the request line, as bytes; handlers read the raw request themselves
+        line_end = request.find(b"\r\n")
+        if line_end == -1:
+            line_end = len(request)
+        method_end = request.find(b" ", 0, line_end)
+        if method_end == -1:
+            send_response(cl, _RESP_BAD_REQUEST, close)
             return
-
-        method = parts[0]
-        path = parts[1]
+        path_end = request.find(b" ", method_end + 1, line_end)
+        if path_end == -1:
+            path_end = line_end
 
         # Remove query parameters from path for routing
-        if '?' in path:
-            path = path.split('?')[0]
+        query_start = request.find(b"?", method_end + 1, path_end)
+        if query_start != -1:
+            path_end = query_start
 
-        # Removed verbose HTTP request logs to save log space
+        method = request[:method_end]
+        path = request[method_end + 1:path_end]
 
-        # Route requests
-        if method == "GET" and path == METRICS_ENDPOINT:
-            # Prometheus metrics endpoint
-            temp, hum = read_dht22()
-            if temp is not None and hum is not None:
-                metrics = format_metrics(temp, hum)
-                cl.send("HTTP/1.0 200 OK\r\nContent-Type: text/plain\r\n\r\n")
-                cl.send(metrics)
-            else:
-                cl.send("HTTP/1.0 503 Service Unavailable\r\nContent-Type: text/plain\r\n\r\nSensor unavailable")
-
-        elif method == "GET" and path == "/health":
-            # Health check endpoint
-            sensor_data = read_dht22()
-            system_info = get_system_info()
-            response = handle_health_check(sensor_data, system_info, ota_updater, wlan, ssid, request_str)
-            cl.send(response)
-
-        elif method == "GET" and path == "/config":
-            # Configuration page
-            response = handle_config_page()
-            cl.send(response)
-
-        elif method == "POST" and path == "/config":
-            # Configuration update
-            response = handle_config_update(request, ota_updater)
-            cl.send(response)
-
-        elif method == "GET" and path == "/logs":
-            # Logs page endpoint
-            response = handle_logs_page(request)
-            cl.send(response)
-
-        elif method == "GET" and path == "/update":
-            # Manual update trigger - immediate execution
-            response = handle_update_request()
-            cl.send(response)
-
-            # If update was started, perform it after sending response
-            if update_in_progress:
-                perform_immediate_update()
-
-        elif method == "GET" and path == "/reboot":
-            # Manual reboot trigger
-            response = handle_reboot_request()
-            cl.send(response)
+        # Removed verbose HTTP request logs to save log space
 
-        elif method == "GET" and path == "/":
-            # Root endpoint - dashboard interface
-            sensor_data = read_dht22()
-            system_info = get_system_info()
-            response = handle_root_page(sensor_data, system_info, ota_updater)
-            cl.send(response)
+        handler = ROUTES.get((method, path))
+        if handler is None:
+            send_response(cl, _RESP_METHOD_NOT_ALLOWED.get(path, _RESP_NOT_FOUND), close)
+            return
 
-        else:
-            # 404 Not Found
-            cl.send("HTTP/1.0 404 Not Found\r\nContent-Type: text/plain\r\n\r\nEndpoint not found")
+        send_response(cl, handler(request), close)
 
     except Exception as e:
         log_error(f"Request handling error: {e}", "HTTP")
         try:
-            cl.send("HTTP/1.0 500 Internal Server Error\r\nContent-Type: text/plain\r\n\r\nInternal server error")
-        except:
+            send_response(cl, _RESP_SERVER_ERROR, close)
+        except OSError:
             pass  # Connection might be closed
 
 
+async def read_request(reader):
+    """
+    Read an HTTP request from the client stream.
+
+    The first segment arrives in the shared receive buffer and is copied out
+    before the next await, so concurrent clients never see each other's data.
+    Reading continues until the headers end and any Content-Length body is in,
+    bounded by the buffer size.
+
+    Args:
+        reader: Client connection stream.
+
+    Returns:
+        tuple: (request, complete). request is the data received (empty if
+            nothing was); complete is False when the headers never ended, the
+            body did not fit, or more data than the request declared arrived.
+            The connection cannot be reused after an incomplete read, since
+            its next bytes would not start a new request.
+    """
+    received = await reader.readinto(_REQMV)
+    if not received:
+        return b"", False
+
+    request = bytes(_REQMV[:received])
+    # Headers may be split across segments
+    while request.find(b"\r\n\r\n") == -1 and len(request) < len(_REQBUF):
+        chunk = await reader.read(len(_REQBUF) - len(request))
+        if not chunk:
+            break
+        request += chunk
+
+    expected = get_request_length(request)
+    if expected == -1:
+        return request, False
+
+    # Read the remaining body, still bounded by the receive buffer size
+    while len(request) < expected and len(request) < len(_REQBUF):
+        chunk = await reader.read(min(expected, len(_REQBUF)) - len(request))
+        if not chunk:
+            break
+        request += chunk
+
+    return request, len(request) == expected
+
+
 # Main server loop
-def run_server():
+def enable_socket_option(sock, level, option):
+    """
+    Turn on a boolean socket option by name, if this port provides it.
+
+    Args:
+        sock: Socket to configure.
+        level (str): Name of the option level in the socket module (e.g. "SOL_SOCKET").
+        option (str): Name of the option in the socket module (e.g. "SO_KEEPALIVE").
     """
-    Run the main HTTP server loop with improved error handling and OTA integration.
+    if hasattr(socket, level) and hasattr(socket, option):
+        try:
+            sock.setsockopt(getattr(socket, level), getattr(socket, option), 1)
+        except OSError:
+            pass
+
+
+def set_nodelay(sock):
     """
-    addr = socket.getaddrinfo(SERVER_CONFIG["host"], SERVER_CONFIG["port"])[0][-1]
-    s = socket.socket()
-    s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    s.bind(addr)
-    s.listen(1)
+    Disable Nagle's algorithm so small response parts go out immediately.
 
-    log_info(f"HTTP server listening on {SERVER_CONFIG['host']}:{SERVER_CONFIG['port']}", "SYSTEM")
+    Args:
+        sock: Socket to configure. Ports without TCP_NODELAY are left unchanged.
+    """
+    enable_socket_option(sock, "IPPROTO_TCP", "TCP_NODELAY")
+
+
+def wants_keep_alive(request):
+    """
+    Tell whether the client expects the connection to stay open.
+
+    Args:
+        request (bytes): Raw HTTP request data.
+
+    Returns:
+        bool: True for HTTP/1.1 requests without a "Connection: close" header.
+    """
+    line_end = request.find(b"\r\n")
+    if line_end < 8 or request[line_end - 8:line_end] != b"HTTP/1.1":
+        return False
+    header_end = request.find(b"\r\n\r\n", line_end)
+    if header_end == -1:
+        header_end = len(request)
+
+    # Header names and the close token are case-insensitive, and the space
+    # after the colon is optional
+    for line in request[line_end + 2:header_end].split(b"\r\n"):
+        if b":" not in line:
+            continue
+        name, value = line.split(b":", 1)
+        if name.strip().lower() == b"connection":
+            for token in value.split(b","):
+                if token.strip().lower() == b"close":
+                    return False
+    return True
+
+
+async def handle_client(reader, writer):
+    """
+    Serve one client connection; started by asyncio for every accepted client.
+
+    Requests are answered in turn on the same connection, so Prometheus can
+    reuse it across scrapes instead of opening a new one each time.
+
+    Args:
+        reader: Client connection stream to read the request from.
+        writer: The same stream, used to send the response.
+    """
+    try:
+        # asyncio creates the sockets itself, so options are set per connection
+        set_nodelay(writer.s)
+        enable_socket_option(writer.s, "SOL_SOCKET", "SO_KEEPALIVE")
+
+        # A stalled or idle client only holds up its own task, never the server
+        timeout = _FIRST_REQUEST_TIMEOUT_S
+        while True:
+            request, complete = await asyncio.wait_for(read_request(reader), timeout)
+            if not request:
+                break
+
+            # Unread bytes of a partial request must not be parsed as the next
+            # one, so the connection closes after answering it
+            close = not complete or not wants_keep_alive(request)
+            handle_request(writer, request, close)
+            await writer.drain()
+            if close:
+                break
+
+            # Reclaim the response garbage now, while the live heap is smallest
+            finish_response()
+            timeout = _KEEP_ALIVE_IDLE_S
+    except asyncio.TimeoutError:
+        pass  # Idle or stalled client; just close the connection
+    except Exception as e:
+        log_error(f"Client handling error: {e}", "HTTP")
+    finally:
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except OSError:
+            pass
+        # Reclaim the last response garbage before the next client
+        finish_response()
+
+
+# How often the watcher checks for a pending update
+_WATCHER_INTERVAL_MS = const(500)
 
+
+async def update_watcher():
+    """
+    Run background work between requests: pending manual updates and uptime sampling.
+
+    Runs on its own schedule, so a requested update starts within half a
+    second whether or not any further requests arrive.
+    """
     while True:
         try:
-            # Accept connections with timeout
-            s.settimeout(1.0)  # 1 second timeout
-            try:
-                cl, addr = s.accept()
-                # Removed verbose connection logs to save log space
-            except OSError:
-                continue  # Timeout, continue loop
-
-            # Handle request
-            try:
-                cl.settimeout(10.0)  # 10 second timeout for client operations
-
-                # Read request with larger buffer for form data
-                request = cl.recv(2048)  # Increased from 1024 to 2048 bytes
-
-                # For POST requests, we might need to read more data
-                if request and b'POST' in request and b'Content-Length:' in request:
-                    try:
-                        # Extract Content-Length header
-                        request_str = request.decode('utf-8')
-                        for line in request_str.split('\r\n'):
-                            if line.lower().startswith('content-length:'):
-                                content_length = int(line.split(':')[1].strip())
-
-                                # Check if we need to read more data
-                                body_start = request_str.find('\r\n\r\n')
-                                if body_start != -1:
-                                    current_body_length = len(request) - (body_start + 4)
-                                    if current_body_length < content_length:
-                                        # Read remaining data
-                                        remaining = content_length - current_body_length
-                                        additional_data = cl.recv(remaining)
-                                        request += additional_data
-                                break
-                    except:
-                        pass  # If parsing fails, use what we have
-
-                if request:
-                    handle_request(cl, request)
-            except Exception as e:
-                log_error(f"Client handling error: {e}", "HTTP")
-            finally:
-                try:
-                    cl.close()
-                except:
-                    pass
-
-        except KeyboardInterrupt:
-            log_info("Server shutdown requested", "SYSTEM")
-            break
+            # A manual update runs only once its confirmation page was sent
+            if update_in_progress:
+                await perform_immediate_update()
+            get_uptime_seconds()  # Keep sampling ticks while idle
         except Exception as e:
             log_error(f"Server error: {e}", "SYSTEM")
-            time.sleep(1)  # Brief pause before retrying
+        await asyncio.sleep_ms(_WATCHER_INTERVAL_MS)
+
 
-    s.close()
+async def serve():
+    """
+    Start the HTTP server, the sensor task and the background watcher, then run forever.
+    """
+    # Small backlog so a scrape arriving during another request is queued, not refused
+    await asyncio.start_server(handle_client, SERVER_CONFIG["host"], SERVER_CONFIG["port"], backlog=5)
+    asyncio.create_task(sensor_loop())
+
+    log_info(f"HTTP server listening on {SERVER_CONFIG['host']}:{SERVER_CONFIG['port']}", "SYSTEM")
+
+    # Collect early and predictably rather than in the middle of building a page
+    gc.collect()
+    gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
+
+    await update_watcher()
+
+
+def run_server():
+    """
+    Run the asyncio HTTP server until interrupted.
+    """
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        log_info("Server shutdown requested", "SYSTEM")
+    finally:
+        asyncio.new_event_loop()  # Drop the stopped loop and its tasks
     log_info("HTTP server stopped", "SYSTEM")
 
 
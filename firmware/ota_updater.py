@@ -33,13 +33,15 @@ class GitHubOTAUpdater:
             self.repo_name = "pico-w-prometheus-dht22"
             self.branch = "main"
 
-        # GitHub URLs
-        self.api_base = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}"
-        self.raw_base = f"https://raw.githubusercontent.com/{self.repo_owner}/{self.repo_name}"
+        # GitHub URLs (the owner/name slug is also reused by get_update_status)
+        self.repo_slug = f"{self.repo_owner}/{self.repo_name}"
+        self.api_base = "https://api.github.com/repos/" + self.repo_slug
+        self.raw_base = "https://raw.githubusercontent.com/" + self.repo_slug
 
         # Local directories
         self.temp_dir = "temp"
         self.update_files = []
+        self._current_version = None
 
         # Ensure temp directory exists
         try:
@@ -66,8 +68,9 @@ class GitHubOTAUpdater:
             self.branch = github_repo.get("branch", "main")
 
             # Update URLs with new config
-            self.api_base = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}"
-            self.raw_base = f"https://raw.githubusercontent.com/{self.repo_owner}/{self.repo_name}"
+            self.repo_slug = f"{self.repo_owner}/{self.repo_name}"
+            self.api_base = "https://api.github.com/repos/" + self.repo_slug
+            self.raw_base = "https://raw.githubusercontent.com/" + self.repo_slug
 
             if old_branch != self.branch:
                 log_info(f"Branch changed: {old_branch} -> {self.branch}", "OTA")
@@ -79,15 +82,19 @@ class GitHubOTAUpdater:
             return False
 
     def get_current_version(self):
-        try:
-            with open("version.txt", "r") as f:
-                return f.read().strip()
-        except OSError:
-            return "unknown"
+        # version.txt only changes through set_current_version, so read it once
+        if self._current_version is None:
+            try:
+                with open("version.txt", "r") as f:
+                    self._current_version = f.read().strip()
+            except OSError:
+                return "unknown"
+        return self._current_version
 
     def set_current_version(self, version):
         with open("version.txt", "w") as f:
             f.write(version)
+        self._current_version = version
 
     def _get_headers(self):
         return {
@@ -284,7 +291,8 @@ class GitHubOTAUpdater:
             except Exception as e:
                 log_error(f"Write failed {filename}: {e}", "OTA")
 
-                # Cleanup
+                # Cleanup (closing again is harmless if it was already closed)
+                response_or_error.close()
                 temp_path = f"{target_dir}/{filename}.tmp" if target_dir else f"{filename}.tmp"
                 try:
                     os.remove(temp_path)
@@ -378,9 +386,6 @@ class GitHubOTAUpdater:
                 final_mem = gc.mem_free()
                 log_info(f"Stage {i} complete: {filename} (mem: {initial_mem}->{final_mem})", "OTA")
 
-                # Brief pause for memory stabilization
-                time.sleep(0.3)
-
             log_info(f"Staged download complete: {len(files_to_download)} files", "OTA")
             return True
 
@@ -599,7 +604,7 @@ class GitHubOTAUpdater:
             "current_version": self.get_current_version(),
             "ota_enabled": ota_enabled,
             "auto_check": auto_check,
-            "repo": f"{self.repo_owner}/{self.repo_name}",
+            "repo": self.repo_slug,
             "branch": self.branch,
             "update_files": self.update_files
         }
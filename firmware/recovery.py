@@ -4,13 +4,30 @@ Only loads when main modules fail to import. ~2KB footprint.
 """
 
 import socket
+import select
 import time
 import network
 from secrets import secrets
 
+HTTP_200_HTML = b"HTTP/1.0 200 OK\r\nContent-Type: text/html\r\n\r\n"
+HTTP_404_HTML = b"HTTP/1.0 404 Not Found\r\nContent-Type: text/html\r\n\r\n"
+HTTP_500_HTML = b"HTTP/1.0 500 Internal Server Error\r\nContent-Type: text/html\r\n\r\n"
+
+_RESTARTING_RESPONSE = HTTP_200_HTML + b"<h1>Restarting...</h1>"
+
+# Receive buffer reused for every recovery request
+_RX_BUF = bytearray(1024)
+
+# Clients that connect but send nothing are dropped after this long
+_CLIENT_TIMEOUT_MS = 5000
+
 # Initialize WiFi for recovery
 wlan = network.WLAN(network.STA_IF)
 wlan.active(True)
+try:
+    wlan.config(pm=0xa11140)  # Disable power saving for a responsive recovery page
+except Exception:
+    pass
 
 # Emergency WiFi connection
 def emergency_connect():
@@ -18,13 +35,15 @@ def emergency_connect():
     print("RECOVERY MODE: Connecting to WiFi...")
     wlan.connect(secrets["ssid"], secrets["pw"])
 
-    max_wait = 20
-    while max_wait > 0:
-        if wlan.status() == 3:
+    # Poll every 100ms for up to 20s; negative status is a hard failure
+    for _ in range(200):
+        status = wlan.status()
+        if status == 3:
             print(f"RECOVERY: WiFi connected, IP: {wlan.ifconfig()[0]}")
             return True
-        max_wait -= 1
-        time.sleep(1)
+        if status < 0:
+            break
+        time.sleep_ms(100)
 
     print("RECOVERY: WiFi connection failed")
     return False
@@ -39,11 +58,17 @@ def recovery_server():
     s = socket.socket()
     s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     s.bind(addr)
-    s.listen(1)
+    s.listen(5)  # Queue a few browser connections instead of refusing them
+    s.setblocking(False)
+
+    # Poll the listener and clients so a stalled browser cannot block recovery
+    poller = select.poll()
+    poller.register(s, select.POLLIN)
 
     print("RECOVERY: Emergency server running on port 80")
 
-    recovery_html = """<!DOCTYPE html>
+    # Page is encoded once, header included, and sent as-is on every default request
+    recovery_page = HTTP_200_HTML + ("""<!DOCTYPE html>
 <html><head><title>RECOVERY MODE</title></head><body>
 <h1 style="color:red">PICO W RECOVERY MODE</h1>
 <p><strong>System failed to boot normally. Emergency recovery active.</strong></p>
@@ -56,39 +81,146 @@ def recovery_server():
 <h3>Status</h3>
 <p>IP Address: """ + wlan.ifconfig()[0] + """</p>
 <p>Recovery Mode Active - Normal modules failed to load</p>
-</body></html>"""
+</body></html>""").encode('utf-8')
+
+    # Accept time of every client waiting to send its request
+    clients = {}
 
     while True:
         try:
-            cl, addr = s.accept()
-            request = cl.recv(1024).decode('utf-8')
-
-            if 'POST /recover' in request:
-                # Parse form data
-                if 'Download+Latest+Firmware' in request:
-                    response = handle_firmware_download()
-                elif 'Restore+Backup' in request:
-                    response = handle_restore_backup()
-                elif 'Restart+Device' in request:
-                    cl.send("HTTP/1.0 200 OK\r\nContent-Type: text/html\r\n\r\n<h1>Restarting...</h1>")
-                    cl.close()
-                    time.sleep(1)
-                    import machine
-                    machine.reset()
+            # Entries may hold more than (object, event), so index them
+            for ev in poller.poll(1000):
+                sock = ev[0]
+                if sock is s:
+                    cl, addr = s.accept()
+                    cl.settimeout(5)
+                    try:
+                        cl.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    except (AttributeError, OSError):
+                        pass
+                    poller.register(cl, select.POLLIN)
+                    clients[cl] = time.ticks_ms()
+                    continue
+
+                poller.unregister(sock)
+                clients.pop(sock, None)
+                if ev[1] & (select.POLLHUP | select.POLLERR):
+                    sock.close()
                 else:
-                    response = "HTTP/1.0 200 OK\r\nContent-Type: text/html\r\n\r\n" + recovery_html
-            else:
-                response = "HTTP/1.0 200 OK\r\nContent-Type: text/html\r\n\r\n" + recovery_html
+                    handle_recovery_request(sock, recovery_page)
 
-            cl.send(response)
-            cl.close()
+            # settimeout only bounds a read once one starts, so silent clients
+            # would otherwise keep their connection and poller slot forever
+            now = time.ticks_ms()
+            for cl in [c for c in clients if time.ticks_diff(now, clients[c]) > _CLIENT_TIMEOUT_MS]:
+                del clients[cl]
+                poller.unregister(cl)
+                try:
+                    cl.close()
+                except OSError:
+                    pass
 
         except Exception as e:
             print(f"RECOVERY: Server error: {e}")
-            try:
+
+def handle_recovery_request(cl, recovery_page):
+    """Serve a single recovery request and close the client socket."""
+    try:
+        received = cl.readinto(_RX_BUF)
+        request = bytes(memoryview(_RX_BUF)[:received or 0])
+
+        # Route on the request line, then look only at the short form body
+        line = request[:request.find(b'\r\n')].split(b' ', 2)
+        body_start = request.find(b'\r\n\r\n')
+        body = request[body_start + 4:] if body_start != -1 else b''
+
+        if len(line) > 1 and line[0] == b'POST' and line[1].startswith(b'/recover'):
+            # Parse form data
+            if b'action=Download' in body:
+                response = handle_firmware_download()
+            elif b'action=Restore' in body:
+                response = handle_restore_backup()
+            elif b'action=Restart' in body:
+                cl.write(_RESTARTING_RESPONSE)
                 cl.close()
-            except:
-                pass
+                time.sleep(1)
+                import machine
+                machine.reset()
+            else:
+                response = None
+        else:
+            response = None
+
+        if response is None:
+            cl.write(recovery_page)
+        else:
+            # Result pages are short; header and body leave in a single write
+            header, body = response
+            if isinstance(body, str):
+                body = body.encode()
+            cl.write(header + body)
+
+    except Exception as e:
+        print(f"RECOVERY: Client error: {e}")
+    finally:
+        try:
+            cl.close()
+        except OSError:
+            pass
+
+def open_tls(host):
+    """Open a TLS connection to host:443 for reuse across several requests."""
+    try:
+        import ssl
+    except ImportError:
+        import ussl as ssl
+
+    sock = socket.socket()
+    sock.connect(socket.getaddrinfo(host, 443)[0][-1])
+    return ssl.wrap_socket(sock, server_hostname=host)
+
+def fetch_to_file(conn, host, path, f, buf):
+    """
+    GET path on an open keep-alive connection, streaming the body to f in
+    len(buf) chunks. Returns (status, keep_open).
+    """
+    conn.write(b"GET " + path.encode() + b" HTTP/1.1\r\nHost: " + host.encode() +
+               b"\r\nConnection: keep-alive\r\n\r\n")
+
+    status = int(conn.readline().split(b" ", 2)[1])
+    length = -1
+    keep_open = True
+    while True:
+        line = conn.readline()
+        if not line or line == b"\r\n":
+            break
+        name, value = line.split(b":", 1)
+        name = name.strip().lower()
+        if name == b"content-length":
+            length = int(value)
+        elif name == b"connection" and value.strip().lower() == b"close":
+            keep_open = False
+        elif name == b"transfer-encoding" and b"chunked" in value.lower():
+            raise OSError("chunked response not supported")
+
+    # Without a length the body ends when the server closes the connection
+    if length < 0:
+        keep_open = False
+
+    mv = memoryview(buf)
+    remaining = length
+    while remaining != 0:
+        n = conn.readinto(mv[:len(buf) if remaining < 0 else min(remaining, len(buf))])
+        if not n:
+            if remaining > 0:
+                raise OSError("connection closed mid-body")
+            break
+        if status == 200:
+            f.write(mv[:n])
+        if remaining > 0:
+            remaining -= n
+
+    return status, keep_open
 
 def handle_firmware_download():
     """Download fresh firmware from GitHub - dynamically discovers all firmware files."""
@@ -102,7 +234,7 @@ def handle_firmware_download():
                 config = ujson.load(f)
             branch = config.get('ota', {}).get('github_repo', {}).get('branch', 'main')
             print(f"RECOVERY: Using branch: {branch}")
-        except:
+        except (OSError, ValueError):
             branch = 'main'
             print("RECOVERY: Using default branch: main")
 
@@ -137,26 +269,53 @@ def handle_firmware_download():
             # Fallback to essential files
             files = ["main.py", "web_interface.py", "ota_updater.py", "device_config.py", "logger.py", "config.py", "recovery.py", "version.txt"]
 
-        # Step 2: Download all discovered files
-        base_url = f"https://raw.githubusercontent.com/TerrifiedBug/pico-w-prometheus-dht22/{branch}/firmware/"
+        # Step 2: Download all discovered files over one reused TLS connection
+        import os
+        host = "raw.githubusercontent.com"
+        base_path = f"/TerrifiedBug/pico-w-prometheus-dht22/{branch}/firmware/"
         success_count = 0
         failed_files = []
+        buf = bytearray(512)
+        conn = None
 
         for filename in files:
+            temp_name = filename + '.tmp'
             try:
                 print(f"RECOVERY: Downloading {filename}")
-                response = urequests.get(base_url + filename)
-                if response.status_code == 200:
-                    with open(filename, 'w') as f:
-                        f.write(response.text)
+                if conn is None:
+                    conn = open_tls(host)
+
+                # Stream into a temp file so a failed download never clobbers the original
+                with open(temp_name, 'wb') as f:
+                    status, keep_open = fetch_to_file(conn, host, base_path + filename, f, buf)
+
+                if status == 200:
+                    os.rename(temp_name, filename)
                     success_count += 1
                     print(f"RECOVERY: Downloaded {filename}")
                 else:
-                    failed_files.append(f"{filename} (HTTP {response.status_code})")
-                response.close()
+                    os.remove(temp_name)
+                    failed_files.append(f"{filename} (HTTP {status})")
+
+                if not keep_open:
+                    conn.close()
+                    conn = None
             except Exception as e:
                 failed_files.append(f"{filename} ({e})")
                 print(f"RECOVERY: Failed to download {filename}: {e}")
+                # Connection state is unknown after an error, start a fresh one
+                try:
+                    conn.close()
+                except OSError:
+                    pass
+                conn = None
+                try:
+                    os.remove(temp_name)
+                except OSError:
+                    pass
+
+        if conn is not None:
+            conn.close()
 
         # Step 3: Report results
         if success_count > 0:
@@ -164,12 +323,12 @@ def handle_firmware_download():
             if failed_files:
                 result_msg += f" Failed: {', '.join(failed_files[:3])}" + ("..." if len(failed_files) > 3 else "")
 
-            return f"HTTP/1.0 200 OK\r\nContent-Type: text/html\r\n\r\n<h1>Recovery Complete</h1><p>{result_msg}</p><p><a href='/'>Restart device</a> to apply changes.</p>"
+            return HTTP_200_HTML, f"<h1>Recovery Complete</h1><p>{result_msg}</p><p><a href='/'>Restart device</a> to apply changes.</p>"
         else:
-            return f"HTTP/1.0 500 Internal Server Error\r\nContent-Type: text/html\r\n\r\n<h1>Download Failed</h1><p>Could not download any firmware files. Errors: {', '.join(failed_files[:5])}</p>"
+            return HTTP_500_HTML, f"<h1>Download Failed</h1><p>Could not download any firmware files. Errors: {', '.join(failed_files[:5])}</p>"
 
     except Exception as e:
-        return f"HTTP/1.0 500 Internal Server Error\r\nContent-Type: text/html\r\n\r\n<h1>Error</h1><p>Recovery failed: {e}</p>"
+        return HTTP_500_HTML, f"<h1>Error</h1><p>Recovery failed: {e}</p>"
 
 def handle_restore_backup():
     """Restore from backup files."""
@@ -177,24 +336,25 @@ def handle_restore_backup():
         import os
         restored = 0
 
-        # Check for backup files
-        for filename in os.listdir():
+        # Check for backup files (ilistdir iterates without building a list)
+        for entry in os.ilistdir():
+            filename = entry[0]
             if filename.endswith('.bak'):
                 original = filename[:-4]  # Remove .bak extension
                 try:
                     os.rename(filename, original)
                     restored += 1
                     print(f"RECOVERY: Restored {original}")
-                except:
+                except OSError:
                     pass
 
         if restored > 0:
-            return f"HTTP/1.0 200 OK\r\nContent-Type: text/html\r\n\r\n<h1>Backup Restored</h1><p>Restored {restored} files from backup. <a href='/'>Restart device</a> to apply changes.</p>"
+            return HTTP_200_HTML, f"<h1>Backup Restored</h1><p>Restored {restored} files from backup. <a href='/'>Restart device</a> to apply changes.</p>"
         else:
-            return "HTTP/1.0 404 Not Found\r\nContent-Type: text/html\r\n\r\n<h1>No Backups Found</h1><p>No backup files available to restore.</p>"
+            return HTTP_404_HTML, b"<h1>No Backups Found</h1><p>No backup files available to restore.</p>"
 
     except Exception as e:
-        return f"HTTP/1.0 500 Internal Server Error\r\nContent-Type: text/html\r\n\r\n<h1>Error</h1><p>Restore failed: {e}</p>"
+        return HTTP_500_HTML, f"<h1>Error</h1><p>Restore failed: {e}</p>"
 
 # Start recovery server
 print("EMERGENCY RECOVERY MODE ACTIVATED")
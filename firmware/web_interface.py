@@ -3,8 +3,8 @@ Minimal Web Interface for Pico W Prometheus DHT22 Sensor
 Ultra-lightweight implementation to maximize memory for OTA updates.
 """
 
-import time
 import gc
+import micropython
 from logger import log_info, log_warn, log_error, log_debug, get_logger
 from device_config import (
     load_device_config,
@@ -14,231 +14,472 @@ from device_config import (
 )
 from config import SENSOR_CONFIG, WIFI_CONFIG, SERVER_CONFIG, METRICS_ENDPOINT
 
+try:
+    # Available from MicroPython 1.21; without it responses go out uncompressed
+    import deflate
+    import io
+except ImportError:
+    deflate = None
+
+# Precompiled HTTP status lines and headers. Handlers return a (header, body)
+# tuple and the server sends both parts, so the body is never copied into a
+# combined response string. The header block is left open: the server adds
+# Content-Length before the blank line that ends it.
+H_200_HTML = b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n"
+H_200_TEXT = b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\n"
+# Prometheus text exposition format, always sent uncompressed
+H_200_METRICS = b"HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+# Pages sent compressed or not depending on Accept-Encoding carry Vary, so
+# caches keep the two variants apart
+H_200_TEXT_VARY = b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\nVary: Accept-Encoding\r\n"
+H_200_TEXT_GZIP = b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\nContent-Encoding: gzip\r\nVary: Accept-Encoding\r\n"
+# Empty favicon the browser may cache for a day instead of asking on every refresh
+H_204_CACHED = b"HTTP/1.1 204 No Content\r\nCache-Control: public, max-age=86400\r\n"
+H_302_CONFIG = b"HTTP/1.1 302 Found\r\nLocation: /config\r\n"
+H_302_LOGS = b"HTTP/1.1 302 Found\r\nLocation: /logs\r\n"
+H_400_TEXT = b"HTTP/1.1 400 Bad Request\r\nContent-Type: text/plain\r\n"
+H_404_TEXT = b"HTTP/1.1 404 Not Found\r\nContent-Type: text/plain\r\n"
+H_405_TEXT = b"HTTP/1.1 405 Method Not Allowed\r\nContent-Type: text/plain\r\n"
+H_500_HTML = b"HTTP/1.1 500 Internal Server Error\r\nContent-Type: text/html\r\n"
+H_500_TEXT = b"HTTP/1.1 500 Internal Server Error\r\nContent-Type: text/plain\r\n"
+H_503_HTML = b"HTTP/1.1 503 Service Unavailable\r\nContent-Type: text/html\r\n"
+H_503_TEXT = b"HTTP/1.1 503 Service Unavailable\r\nContent-Type: text/plain\r\n"
+
+# Link bar shared by the dashboard and health pages, built once at import with
+# the configured metrics path
+_NAV_LINKS = (
+    b'<a href="/config">Config</a> | <a href="/logs">Logs</a> | <a href="/update">Update</a> | <a href="'
+    + METRICS_ENDPOINT.encode()
+    + b'">Metrics</a> | <a href="/reboot">Reboot</a>'
+)
+
+# Closing chunks of the dashboard and health pages, link bar included
+_ROOT_TAIL = b'KB</p>\n<h2>Links</h2>\n<p><a href="/health">Health</a> | ' + _NAV_LINKS + b"</p>\n</body></html>"
+_HEALTH_TAIL = b'</p>\n\n<h2>Links</h2>\n<p><a href="/">Dashboard</a> | ' + _NAV_LINKS + b"</p>\n</body></html>"
+
+# Health report, filled by handle_health_check with a single %-format
+_HEALTH_TMPL = """<!DOCTYPE html><html><head><title>Health Check</title></head><body>
+<h1>PICO W HEALTH CHECK</h1>
 
-def unquote_plus(string):
-    """MicroPython-compatible URL decoding function."""
-    # Replace + with spaces
-    string = string.replace('+', ' ')
+<h2>Device Information</h2>
+<p><strong>Device:</strong> %s<br>
+<strong>Location:</strong> %s<br>
+<strong>Version:</strong> %s</p>
 
-    # Basic URL decoding for common characters
-    replacements = {
-        '%20': ' ', '%21': '!', '%22': '"', '%23': '#', '%24': '$', '%25': '%',
-        '%26': '&', '%27': "'", '%28': '(', '%29': ')', '%2A': '*', '%2B': '+',
-        '%2C': ',', '%2D': '-', '%2E': '.', '%2F': '/', '%3A': ':', '%3B': ';',
-        '%3C': '<', '%3D': '=', '%3E': '>', '%3F': '?', '%40': '@', '%5B': '[',
-        '%5C': '\\', '%5D': ']', '%5E': '^', '%5F': '_', '%60': '`', '%7B': '{',
-        '%7C': '|', '%7D': '}', '%7E': '~'
-    }
+<h2>Sensor Status</h2>
+<p><strong>Status:</strong> %s<br>
+<strong>Temperature:</strong> %s C<br>
+<strong>Humidity:</strong> %s%%<br>
+<strong>Sensor Pin:</strong> GPIO %d</p>
 
-    for encoded, decoded in replacements.items():
-        string = string.replace(encoded, decoded)
+<h2>Network Status</h2>
+<p><strong>Network:</strong> %s<br>
+<strong>IP Address:</strong> %s<br>
+<strong>SSID:</strong> %s</p>
 
-    return string
+<h2>System Resources</h2>
+<p><strong>Uptime:</strong> %dd %02d:%02d<br>
+<strong>Free Memory:</strong> %s bytes (%sKB)<br>
+<strong>OTA Status:</strong> %s""" + _HEALTH_TAIL.decode().replace("%", "%%")
+
+# Parsed device config, kept until handle_config_update saves a new one
+_cfg_cache = {"metrics": None, "device": None}
+
+
+def get_cached_version(ota_updater):
+    """Return the firmware version; the updater reads version.txt only once."""
+    return ota_updater.get_current_version() if ota_updater else "unknown"
+
+
+def get_cached_metrics_config():
+    """Return the label config, reading device_config.json only when not cached."""
+    if _cfg_cache["metrics"] is None:
+        _cfg_cache["metrics"] = get_config_for_metrics()
+    return _cfg_cache["metrics"]
+
+
+def _get_device_config():
+    """Return the full device config, reading device_config.json only when not cached."""
+    if _cfg_cache["device"] is None:
+        _cfg_cache["device"] = load_device_config()
+    return _cfg_cache["device"]
+
+
+def finish_response():
+    """Reclaim a finished response's garbage, once the client socket is closed."""
+    gc.collect()
+
+
+def _accepts_gzip(request):
+    """Return True if deflate is available and the Accept-Encoding header allows gzip."""
+    if deflate is None:
+        return False
+    header_end = request.find(b"\r\n\r\n")
+    if header_end == -1:
+        header_end = len(request)
+
+    # Only the Accept-Encoding value counts, not "gzip" elsewhere in the headers
+    start = request.find(b"\r\nAccept-Encoding:", 0, header_end)
+    if start == -1:
+        start = request.find(b"\r\naccept-encoding:", 0, header_end)
+    if start == -1:
+        return False
+    start += 18
+    end = request.find(b"\r\n", start)
+    if end == -1 or end > header_end:
+        end = header_end
+
+    wildcard = False
+    for coding in request[start:end].lower().split(b","):
+        parts = coding.split(b";", 1)
+        name = parts[0].strip()
+        # q=0, q=0.0, ... mark a coding as not acceptable
+        accepted = True
+        if len(parts) == 2:
+            q = parts[1].find(b"q=")
+            if q != -1 and not parts[1][q + 2:].split(b";")[0].strip().strip(b"0."):
+                accepted = False
+        if name == b"gzip":
+            return accepted
+        if name == b"*":
+            wildcard = accepted
+    return wildcard
+
+
+def _gzip_parts(parts):
+    """Compress a tuple of str/bytes parts into a single gzip member."""
+    buf = io.BytesIO()
+    stream = deflate.DeflateIO(buf, deflate.GZIP)
+    for part in parts:
+        stream.write(part)
+    stream.close()
+    return buf.getvalue()
+
+
+# Hex digit value for every byte (0xFF where the byte is not a hex digit)
+_HEX = bytearray(b"\xff" * 256)
+for _i, _c in enumerate(b"0123456789abcdef"):
+    _HEX[_c] = _i
+for _i, _c in enumerate(b"ABCDEF"):
+    _HEX[_c] = 10 + _i
+del _i, _c
+
+
+@micropython.viper
+def _urldecode(src: ptr8, dst: ptr8, n: int) -> int:
+    """Decode n URL-encoded bytes from src into dst, returning the length written."""
+    hexval = ptr8(_HEX)
+    written = 0
+    i = 0
+    while i < n:
+        c = int(src[i])
+        if c == 0x2B:  # '+'
+            c = 0x20
+        elif c == 0x25 and i + 2 < n:  # '%'
+            high = int(hexval[src[i + 1]])
+            low = int(hexval[src[i + 2]])
+            if high != 0xFF and low != 0xFF:
+                c = (high << 4) | low
+                i += 2
+        dst[written] = c
+        written += 1
+        i += 1
+    return written
+
+
+@micropython.native
+def unquote_plus(raw):
+    """Decode a URL-encoded form field (bytes) into a str."""
+    length = len(raw)
+    out = bytearray(length)
+    written = _urldecode(raw, out, length)
+
+    # Escapes may form multi-byte UTF-8 sequences, so decode once at the end
+    return str(memoryview(out)[:written], "utf-8")
+
+
+@micropython.native
+def get_query_string(request):
+    """Return the raw query string (bytes) from the request line of an HTTP request."""
+    line_end = request.find(b"\r\n")
+    query_start = request.find(b"?", 0, line_end)
+    if query_start == -1:
+        return b""
+    query_end = request.find(b" ", query_start)
+    return request[query_start + 1:query_end]
+
+
+def get_request_length(request):
+    """
+    Return the total length a request declares: its headers plus Content-Length body.
+
+    Returns -1 while the header block is unterminated or the Content-Length is invalid.
+    """
+    header_end = request.find(b"\r\n\r\n")
+    if header_end == -1:
+        return -1
+    body_start = header_end + 4
+
+    # Locate Content-Length within the headers only
+    length_start = request.find(b"Content-Length:", 0, header_end)
+    if length_start == -1:
+        length_start = request.find(b"content-length:", 0, header_end)
+    if length_start == -1:
+        return body_start
+
+    length_end = request.find(b"\r\n", length_start)
+    try:
+        content_length = int(request[length_start + 15:length_end])
+    except ValueError:
+        return -1
+    return body_start + content_length if content_length >= 0 else -1
+
+
+@micropython.native
+def get_query_param(query, key, default=""):
+    """Return the decoded value for key (bytes including '=', e.g. b"level=") in a raw query string."""
+    start = 0
+    while True:
+        pos = query.find(key, start)
+        if pos == -1:
+            return default
+        # Only match at the start of a parameter, not inside another name
+        if pos == 0 or query[pos - 1] == 0x26:  # '&'
+            break
+        start = pos + 1
+
+    pos += len(key)
+    end = query.find(b"&", pos)
+    return query[pos:end if end != -1 else len(query)].decode("utf-8")
 
 
 def handle_root_page(sensor_data, system_info, ota_updater):
     """Handle root page with minimal plain text dashboard."""
     try:
         temp, hum = sensor_data
+        sensor_ok = temp is not None
+        temp_str = str(temp) if sensor_ok else "N/A"
+        hum_str = str(hum) if hum is not None else "N/A"
         wifi_status, _, ip_address = system_info["wifi"]
         uptime_hours, uptime_minutes = system_info["uptime"]
         memory_mb = system_info["memory"]
-        version = ota_updater.get_current_version() if ota_updater else "unknown"
-
-        config = get_config_for_metrics()
+        version = get_cached_version(ota_updater)
+        config = get_cached_metrics_config()
         location, device_name = config["location"], config["device"]
 
-        # Ultra-minimal HTML
-        html = f"""<!DOCTYPE html><html><head><title>Pico W Sensor</title></head><body>
+        # Ultra-minimal HTML, sent part by part: constant chunks plus small values
+        body = (
+            b"""<!DOCTYPE html><html><head><title>Pico W Sensor</title></head><body>
 <h1>Pico W Sensor Dashboard</h1>
-<p><strong>Device:</strong> {device_name} | <strong>Location:</strong> {location} | <strong>Version:</strong> {version}</p>
-<h2>Status</h2>
-<p>Sensor: {"OK" if temp is not None else "FAIL"} | Temp: {temp if temp else "N/A"}C | Humidity: {hum if hum else "N/A"}%</p>
-<p>Network: {wifi_status} | IP: {ip_address}</p>
-<p>Uptime: {uptime_hours:02d}:{uptime_minutes:02d} | Memory: {memory_mb}KB</p>
-<h2>Links</h2>
-<p><a href="/health">Health</a> | <a href="/config">Config</a> | <a href="/logs">Logs</a> | <a href="/update">Update</a> | <a href="/metrics">Metrics</a> | <a href="/reboot">Reboot</a></p>
-</body></html>"""
-
-        return f"HTTP/1.0 200 OK\r\nContent-Type: text/html\r\n\r\n{html}"
+<p><strong>Device:</strong> """, device_name,
+            b" | <strong>Location:</strong> ", location,
+            b" | <strong>Version:</strong> ", version,
+            b"</p>\n<h2>Status</h2>\n<p>Sensor: ", "OK" if sensor_ok else "FAIL",
+            b" | Temp: ", temp_str,
+            b"C | Humidity: ", hum_str,
+            b"%</p>\n<p>Network: ", wifi_status,
+            b" | IP: ", ip_address,
+            b"</p>\n<p>Uptime: ", "%02d:%02d" % (uptime_hours, uptime_minutes),
+            b" | Memory: ", str(memory_mb),
+            _ROOT_TAIL,
+        )
+
+        return H_200_HTML, body
     except Exception as e:
         log_error(f"Root page error: {e}", "HTTP")
-        return f"HTTP/1.0 500 Internal Server Error\r\nContent-Type: text/plain\r\n\r\nError: {e}"
+        return H_500_TEXT, f"Error: {e}"
 
 
-def handle_health_check(sensor_data, system_info, ota_updater, wlan, ssid, request_str=""):
+def handle_health_check(sensor_data, system_info, ota_updater, ssid):
     """Handle health check with minimal HTML and clickable links."""
     try:
         temp, hum = sensor_data
+        sensor_ok = temp is not None
+        temp_str = str(temp) if sensor_ok else "ERROR"
+        hum_str = str(hum) if hum is not None else "ERROR"
         wifi_status, _, ip_address = system_info["wifi"]
+        connected = wifi_status == "Connected"
         uptime_days, uptime_hours, uptime_minutes = system_info["uptime_detailed"]
         free_memory, memory_mb, _ = system_info["memory_detailed"]
 
-        version = ota_updater.get_current_version() if ota_updater else "unknown"
-        config = get_config_for_metrics()
+        version = get_cached_version(ota_updater)
+        config = get_cached_metrics_config()
         location, device_name = config["location"], config["device"]
 
-        # Minimal HTML health report with clickable links
-        health_html = f"""<!DOCTYPE html><html><head><title>Health Check</title></head><body>
-<h1>PICO W HEALTH CHECK</h1>
-
-<h2>Device Information</h2>
-<p><strong>Device:</strong> {device_name}<br>
-<strong>Location:</strong> {location}<br>
-<strong>Version:</strong> {version}</p>
-
-<h2>Sensor Status</h2>
-<p><strong>Status:</strong> {"OK" if temp is not None else "FAIL"}<br>
-<strong>Temperature:</strong> {temp if temp is not None else "ERROR"} C<br>
-<strong>Humidity:</strong> {hum if hum is not None else "ERROR"}%<br>
-<strong>Sensor Pin:</strong> GPIO {SENSOR_CONFIG['pin']}</p>
-
-<h2>Network Status</h2>
-<p><strong>Network:</strong> {wifi_status}<br>
-<strong>IP Address:</strong> {ip_address}<br>
-<strong>SSID:</strong> {ssid if wlan.isconnected() else "Not connected"}</p>
-
-<h2>System Resources</h2>
-<p><strong>Uptime:</strong> {uptime_days}d {uptime_hours:02d}:{uptime_minutes:02d}<br>
-<strong>Free Memory:</strong> {free_memory:,} bytes ({memory_mb}KB)<br>
-<strong>OTA Status:</strong> {"Enabled" if ota_updater else "Disabled"}</p>
-
-<h2>Links</h2>
-<p><a href="/">Dashboard</a> | <a href="/config">Config</a> | <a href="/logs">Logs</a> | <a href="/update">Update</a> | <a href="/metrics">Metrics</a> | <a href="/reboot">Reboot</a></p>
-</body></html>"""
-
-        return f"HTTP/1.0 200 OK\r\nContent-Type: text/html\r\n\r\n{health_html}"
+        # Minimal HTML health report, filled with one %-format and encoded once;
+        # serve_health caches the result, so it is sent as a single chunk
+        body = _HEALTH_TMPL % (
+            device_name, location, version,
+            "OK" if sensor_ok else "FAIL", temp_str, hum_str, SENSOR_CONFIG["pin"],
+            wifi_status, ip_address, ssid if connected else "Not connected",
+            uptime_days, uptime_hours, uptime_minutes,
+            "{:,}".format(free_memory), memory_mb,
+            "Enabled" if ota_updater else "Disabled",
+        )
+
+        return H_200_HTML, body.encode()
     except Exception as e:
         log_error(f"Health check failed: {e}", "SYSTEM")
-        return f"HTTP/1.0 500 Internal Server Error\r\nContent-Type: text/html\r\n\r\n<h1>Health Check Failed</h1><p>Error: {e}</p><p><a href='/'>Return home</a></p>"
+        return H_500_HTML, (b"<h1>Health Check Failed</h1><p>Error: ", str(e), b"</p><p><a href='/'>Return home</a></p>")
 
 
 def handle_config_page():
     """Handle configuration page with minimal HTML form."""
     try:
-        config = load_device_config()
+        config = _get_device_config()
         device_config = config.get("device", {})
         ota_config = config.get("ota", {})
-
-        location = device_config.get("location", "default-location")
-        device_name = device_config.get("name", "default-device")
-        description = device_config.get("description", "")
+        github_repo = ota_config.get("github_repo", {})
 
         ota_enabled = ota_config.get("enabled", True)
         auto_update = ota_config.get("auto_update", True)
-        update_interval = ota_config.get("update_interval", 1.0)
-        github_repo = ota_config.get("github_repo", {})
-        repo_owner = github_repo.get("owner", "TerrifiedBug")
-        repo_name = github_repo.get("name", "pico-w-prometheus-dht22")
         branch = github_repo.get("branch", "main")
 
-        # Minimal HTML form
-        html = f"""<!DOCTYPE html><html><head><title>Device Config</title></head><body>
+        location = device_config.get("location", "default-location")
+        device_name = device_config.get("name", "default-device")
+        repo_owner = github_repo.get("owner", "TerrifiedBug")
+        repo_name = github_repo.get("name", "pico-w-prometheus-dht22")
+        description = device_config.get("description", "")
+        update_interval = str(ota_config.get("update_interval", 1.0))
+
+        # Resolve every conditional once so the body below is plain lookups
+        ota_text = "Enabled" if ota_enabled else "Disabled"
+        auto_text = "Yes" if auto_update else "No"
+        chk_ota = "checked" if ota_enabled else ""
+        chk_auto = "checked" if auto_update else ""
+        sel_main = "selected" if branch == "main" else ""
+        sel_dev = "selected" if branch == "dev" else ""
+
+        # Minimal HTML form, sent part by part like the dashboard
+        body = (
+            b"""<!DOCTYPE html><html><head><title>Device Config</title></head><body>
 <h1>Device Configuration</h1>
 <p><a href="/">Back</a> | <a href="/health">Health</a> | <a href="/logs">Logs</a></p>
 
 <h2>Current Settings</h2>
-<p>Device: {device_name} | Location: {location}</p>
-<p>OTA: {"Enabled" if ota_enabled else "Disabled"} | Auto: {"Yes" if auto_update else "No"}</p>
-<p>Repo: {repo_owner}/{repo_name} ({branch})</p>
+<p>Device: """, device_name,
+            b" | Location: ", location,
+            b"</p>\n<p>OTA: ", ota_text,
+            b" | Auto: ", auto_text,
+            b"</p>\n<p>Repo: ", repo_owner,
+            b"/", repo_name,
+            b" (", branch,
+            b''')</p>
 
 <h2>Update Configuration</h2>
 <form method="POST">
-<p>Location: <input type="text" name="location" value="{location}" size="20"></p>
-<p>Device Name: <input type="text" name="device" value="{device_name}" size="20"></p>
-<p>Description: <input type="text" name="description" value="{description}" size="30"></p>
-<p><input type="checkbox" name="ota_enabled" {"checked" if ota_enabled else ""}> Enable OTA Updates</p>
-<p><input type="checkbox" name="auto_update" {"checked" if auto_update else ""}> Auto Updates</p>
-<p>Update Interval (hours): <input type="number" name="update_interval" value="{update_interval}" min="0.5" max="168" step="0.5" size="5"></p>
-<p>Repo Owner: <input type="text" name="repo_owner" value="{repo_owner}" size="15"></p>
-<p>Repo Name: <input type="text" name="repo_name" value="{repo_name}" size="25"></p>
+<p>Location: <input type="text" name="location" value="''', location,
+            b'''" size="20"></p>
+<p>Device Name: <input type="text" name="device" value="''', device_name,
+            b'''" size="20"></p>
+<p>Description: <input type="text" name="description" value="''', description,
+            b'''" size="30"></p>
+<p><input type="checkbox" name="ota_enabled" ''', chk_ota,
+            b'''> Enable OTA Updates</p>
+<p><input type="checkbox" name="auto_update" ''', chk_auto,
+            b'''> Auto Updates</p>
+<p>Update Interval (hours): <input type="number" name="update_interval" value="''', update_interval,
+            b'''" min="0.5" max="168" step="0.5" size="5"></p>
+<p>Repo Owner: <input type="text" name="repo_owner" value="''', repo_owner,
+            b'''" size="15"></p>
+<p>Repo Name: <input type="text" name="repo_name" value="''', repo_name,
+            b'''" size="25"></p>
 <p>Branch: <select name="branch">
-<option value="main" {"selected" if branch == "main" else ""}>main</option>
-<option value="dev" {"selected" if branch == "dev" else ""}>dev</option>
+<option value="main" ''', sel_main,
+            b'''>main</option>
+<option value="dev" ''', sel_dev,
+            b'''>dev</option>
 </select></p>
 <p><input type="submit" value="Save Configuration"></p>
 </form>
-</body></html>"""
+</body></html>''',
+        )
 
-        return f"HTTP/1.0 200 OK\r\nContent-Type: text/html\r\n\r\n{html}"
+        return H_200_HTML, body
     except Exception as e:
         log_error(f"Config page error: {e}", "HTTP")
-        return f"HTTP/1.0 500 Internal Server Error\r\nContent-Type: text/plain\r\n\r\nConfig error: {e}"
+        return H_500_TEXT, f"Config error: {e}"
 
 
 def handle_logs_page(request):
     """Handle logs page with plain text output."""
     try:
-        request_str = request.decode('utf-8')
-        query_params = {}
-
-        if '?' in request_str:
-            query_string = request_str.split('?')[1].split(' ')[0]
-            for param in query_string.split('&'):
-                if '=' in param:
-                    key, value = param.split('=', 1)
-                    query_params[key] = value
-
-        level_filter = query_params.get('level', 'ALL')
-        category_filter = query_params.get('category', 'ALL')
-        action = query_params.get('action', '')
+        query = get_query_string(request)
+        level_filter = get_query_param(query, b"level=", "ALL")
+        category_filter = get_query_param(query, b"category=", "ALL")
+        action = get_query_param(query, b"action=")
 
         if action == 'clear':
             logger = get_logger()
             logger.clear_logs()
             log_info("Logs cleared via web interface", "SYSTEM")
-            return "HTTP/1.0 302 Found\r\nLocation: /logs\r\n\r\n"
+            return H_302_LOGS, b""
 
         logger = get_logger()
         stats = logger.get_statistics()
-        logs = logger.get_logs(level_filter, category_filter, last_n=50)
-
-        log_lines = []
-        for log in logs:
-            timestamp_str = f"+{log['t']}s"
-            line = f"[{timestamp_str:>6}] {log['l']:5} {log['c']:7}: {log['m']}"
-            log_lines.append(line)
-
-        logs_text = "\n".join(log_lines) if log_lines else "No logs found."
-
-        response_text = f"""System Logs
-===========
-
-Stats: {stats['total_entries']} entries | {stats['memory_usage_kb']}KB | Errors: {stats['logs_by_level']['ERROR']}
-
-Filter: level={level_filter} category={category_filter}
-Links: /logs?level=ERROR /logs?level=OTA /logs?action=clear
-
-{logs_text}
-
-Showing last 50 entries. Logs cleared on restart.
-"""
-
-        return f"HTTP/1.0 200 OK\r\nContent-Type: text/plain\r\n\r\n{response_text}"
+        log_lines = logger.get_log_lines(level_filter, category_filter, last_n=50)
+
+        # Send the summary, every log line and the footer as separate parts, so
+        # the (largest) log text is never joined into one string
+        body = (
+            "System Logs\n===========\n\nStats: %d entries | %sKB | Errors: %d\n\n"
+            "Filter: level=%s category=%s\n" % (
+                stats['total_entries'], stats['memory_usage_kb'],
+                stats['logs_by_level']['ERROR'], level_filter, category_filter),
+            b"Links: /logs?level=ERROR /logs?level=OTA /logs?action=clear\n\n",
+        ) + log_lines + (
+            b"\nShowing last 50 entries. Logs cleared on restart.\n",
+        )
+
+        # Log text is the largest and most repetitive page, so it compresses well
+        if _accepts_gzip(request):
+            return H_200_TEXT_GZIP, _gzip_parts(body)
+
+        return H_200_TEXT_VARY, body
     except Exception as e:
         log_error(f"Logs page error: {e}", "HTTP")
-        return f"HTTP/1.0 500 Internal Server Error\r\nContent-Type: text/plain\r\n\r\nLogs error: {e}"
+        return H_500_TEXT, f"Logs error: {e}"
 
 
+@micropython.native
 def parse_form_data(request):
     """Parse form data from HTTP POST request."""
     MAX_KEY_LEN = 32
     MAX_VALUE_LEN = 256  # Increased from 128 to 256 to handle longer repo names
+    MAX_BODY_LEN = 1024
+    MAX_PAIRS = 16
     try:
-        request_str = request.decode("utf-8")
-        body_start = request_str.find("\r\n\r\n")
+        body_start = request.find(b"\r\n\r\n")
         if body_start == -1:
             return {}
-        form_body = request_str[body_start + 4 :]
+        body_start += 4
+        # Without a usable Content-Length, the body is whatever was received
+        declared = get_request_length(request)
+        body_end = declared if declared > body_start else len(request)
+
+        # Bound the work done per request regardless of what the client sent
+        end = min(body_end, len(request), body_start + MAX_BODY_LEN)
+        form_body = request[body_start:end]
+        if end < body_end and request[end:end + 1] != b"&":
+            # Cut short by the cap or the receive buffer, so the last pair may be
+            # incomplete; drop it rather than save a truncated value
+            cut = form_body.rfind(b"&")
+            form_body = form_body[:cut] if cut != -1 else b""
         if not form_body:
             return {}
 
         form_data = {}
-        pairs = form_body.split("&")
+        pairs = form_body.split(b"&", MAX_PAIRS)[:MAX_PAIRS]
 
         for pair in pairs:
-            if "=" in pair:
-                key, value = pair.split("=", 1)
+            if b"=" in pair:
+                # Only the individual keys and values are decoded to str
+                key, value = pair.split(b"=", 1)
+
+                # Skip fields that cannot fit even if every character is %-escaped
+                if len(key) > 3 * MAX_KEY_LEN or len(value) > 3 * MAX_VALUE_LEN:
+                    continue
+
                 key_decoded = unquote_plus(key)[:MAX_KEY_LEN]
                 value_decoded = unquote_plus(value)[:MAX_VALUE_LEN]
 
@@ -258,6 +499,7 @@ def handle_config_update(request, ota_updater=None):
         config = validate_config_input(form_data)
 
         if save_device_config(config):
+            _cfg_cache["metrics"] = _cfg_cache["device"] = None
             log_info(f"Config updated: {config['device']['location']}/{config['device']['name']}", "CONFIG")
 
             # Reload OTA config if OTA updater exists and config contains OTA changes
@@ -270,10 +512,10 @@ def handle_config_update(request, ota_updater=None):
                 except Exception as e:
                     log_error(f"Error reloading OTA config: {e}", "CONFIG")
 
-            return "HTTP/1.0 302 Found\r\nLocation: /config\r\n\r\n"
+            return H_302_CONFIG, b""
         else:
             log_error("Failed to save configuration", "CONFIG")
-            return "HTTP/1.0 500 Internal Server Error\r\nContent-Type: text/plain\r\n\r\nFailed to save config"
+            return H_500_TEXT, b"Failed to save config"
     except Exception as e:
         log_error(f"Config update failed: {e}", "CONFIG")
-        return f"HTTP/1.0 400 Bad Request\r\nContent-Type: text/plain\r\n\r\nConfig update failed: {e}"
+        return H_400_TEXT, f"Config update failed: {e}"
@@ -0,0 +1,30 @@
+# MicroPython manifest for building a Pico W firmware image with frozen modules.
+#
+# Build from a MicroPython checkout:
+#   make -C ports/rp2 BOARD=RPI_PICO_W FROZEN_MANIFEST=/path/to/manifest.py
+#
+# Frozen modules run straight from flash, so their bytecode and string
+# literals are not copied to the heap and are not parsed at boot. Files on the
+# device filesystem come first on sys.path, so OTA-updated copies still
+# override the frozen versions.
+#
+# opt=3 compiles with the highest optimisation level: asserts and line
+# number tables are dropped, which shrinks the bytecode kept in flash.
+#
+# main.py is left on the filesystem: the firmware only runs main.py from
+# there, and it stays small because the modules it imports are frozen.
+
+include("$(BOARD_DIR)/manifest.py")
+
+freeze(
+    "firmware",
+    (
+        "config.py",
+        "device_config.py",
+        "logger.py",
+        "ota_updater.py",
+        "recovery.py",
+        "web_interface.py",
+    ),
+    opt=3,
+)
@@ -0,0 +1,20 @@
+import builtins
+import sys
+import types
+
+# The firmware uses the @micropython.native / @micropython.viper decorators,
+# which only exist on the device. Under CPython provide a stand-in module whose
+# decorators return the function unchanged, plus viper's ptr8 cast.
+if "micropython" not in sys.modules:
+    try:
+        import micropython  # noqa: F401
+    except ImportError:
+        def _identity(func):
+            return func
+
+        micropython = types.ModuleType("micropython")
+        micropython.native = _identity
+        micropython.viper = _identity
+        micropython.const = _identity
+        sys.modules["micropython"] = micropython
+        builtins.ptr8 = memoryview
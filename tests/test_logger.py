@@ -29,3 +29,23 @@ def test_memory_logger_filters():
     assert len(errors) == 1 and errors[0]['m'] == 'oops'
     system_logs = log.get_logs(category_filter="SYSTEM")
     assert len(system_logs) == 2
+
+
+def test_memory_logger_text_format():
+    log = MemoryLogger(max_entries=5)
+    log.entries.clear()
+    log.error("Update failed", category="OTA")
+    log.entries[0]['t'] = 123
+    assert log.get_logs_as_text() == "[ +123s] ERROR OTA    : Update failed"
+
+
+def test_memory_logger_lines_end_in_newlines():
+    log = MemoryLogger(max_entries=5)
+    log.entries.clear()
+    log.info("one", category="SYSTEM")
+    log.warn("two", category="OTA")
+    lines = log.get_log_lines()
+    assert isinstance(lines, tuple) and len(lines) == 2
+    assert all(line.endswith("\n") for line in lines)
+    assert log.get_log_lines(level_filter="ERROR") == ("No logs found matching criteria.\n",)
+    assert log.get_logs_as_text(level_filter="ERROR") == "No logs found matching criteria."
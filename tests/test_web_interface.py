@@ -0,0 +1,156 @@
+import sys
+from pathlib import Path
+
+# Add firmware directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "firmware"))
+import web_interface
+from web_interface import unquote_plus, parse_form_data
+
+
+def render(body):
+    """Join a handler body (str or tuple of str/bytes parts) into one str."""
+    if not isinstance(body, tuple):
+        body = (body,)
+    return "".join(p.decode() if isinstance(p, bytes) else p for p in body)
+
+
+def test_unquote_plus_decodes_escapes():
+    assert unquote_plus(b"hello+world") == "hello world"
+    assert unquote_plus(b"a%2Fb%3Ac") == "a/b:c"
+    assert unquote_plus(b"100%25") == "100%"
+    assert unquote_plus(b"caf%C3%A9") == "caf\u00e9"
+
+
+def test_unquote_plus_keeps_invalid_escapes():
+    assert unquote_plus(b"50%zz") == "50%zz"
+    assert unquote_plus(b"trailing%") == "trailing%"
+    assert unquote_plus(b"%+1") == "% 1"
+
+
+def test_parse_form_data():
+    request = b"POST /config HTTP/1.1\r\nHost: pico\r\n\r\nlocation=living+room&device=pico%2D1"
+    form = parse_form_data(request)
+    assert form == {"location": "living room", "device": "pico-1"}
+
+
+def test_parse_form_data_without_body():
+    assert parse_form_data(b"POST /config HTTP/1.1\r\nHost: pico\r\n") == {}
+
+
+def test_handle_logs_page_filters_and_clear():
+    header, body = web_interface.handle_logs_page(b"GET /logs?level=ERROR HTTP/1.1\r\n\r\n")
+    assert header == web_interface.H_200_TEXT_VARY
+    assert "Filter: level=ERROR category=ALL" in render(body)
+
+    header, body = web_interface.handle_logs_page(b"GET /logs?action=clear HTTP/1.1\r\n\r\n")
+    assert header == web_interface.H_302_LOGS
+    assert not body
+
+
+def test_handle_config_page_renders_form(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(web_interface._cfg_cache, "device", None)
+    header, body = web_interface.handle_config_page()
+    assert header == web_interface.H_200_HTML
+    html = render(body)
+    assert 'name="location" value="default-location"' in html
+    assert '<option value="main" selected>main</option>' in html
+
+
+def test_config_update_invalidates_cached_config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(web_interface._cfg_cache, "device", None)
+    web_interface.handle_config_page()
+    request = b"POST /config HTTP/1.1\r\n\r\nlocation=lab&device=pico"
+    header, _ = web_interface.handle_config_update(request)
+    assert header == web_interface.H_302_CONFIG
+    _, body = web_interface.handle_config_page()
+    assert 'name="location" value="lab"' in render(body)
+
+
+def test_query_params_use_request_line_only():
+    request = b"GET /logs?level=WARN&category=OTA HTTP/1.1\r\nReferer: /x?level=ERROR\r\n\r\n"
+    query = web_interface.get_query_string(request)
+    assert query == b"level=WARN&category=OTA"
+    assert web_interface.get_query_param(query, b"level=") == "WARN"
+    assert web_interface.get_query_param(query, b"category=") == "OTA"
+    assert web_interface.get_query_param(b"xlevel=1", b"level=", "ALL") == "ALL"
+    assert web_interface.get_query_string(b"GET /logs HTTP/1.1\r\n\r\n") == b""
+
+
+def test_parse_form_data_bounds_pairs_and_lengths():
+    pairs = b"&".join(b"k%d=v" % i for i in range(40))
+    request = b"POST /config HTTP/1.1\r\n\r\n" + b"big=" + b"x" * 900 + b"&" + pairs
+    form = parse_form_data(request)
+    assert form == {"k%d" % i: "v" for i in range(15)}
+
+
+def test_parse_form_data_drops_pair_cut_by_body_cap():
+    body = b"pad=" + b"y" * 700 + b"&device=pico&location=" + b"z" * 400
+    form = parse_form_data(b"POST /config HTTP/1.1\r\n\r\n" + body)
+    assert form == {"pad": "y" * 256, "device": "pico"}
+
+    # A pair ending exactly at the cap is complete and kept
+    body = b"pad=" + b"y" * 700 + b"&device=" + b"p" * 312 + b"&location=lab"
+    form = parse_form_data(b"POST /config HTTP/1.1\r\n\r\n" + body)
+    assert form == {"pad": "y" * 256, "device": "p" * 256}
+
+
+def test_parse_form_data_drops_pair_cut_by_content_length():
+    request = b"POST /config HTTP/1.1\r\nContent-Length: 40\r\n\r\ndevice=pico&location=partial"
+    assert parse_form_data(request) == {"device": "pico"}
+    request = b"POST /config HTTP/1.1\r\nContent-Length: 11\r\n\r\ndevice=pico"
+    assert parse_form_data(request) == {"device": "pico"}
+
+
+def test_handle_root_page_renders_parts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(web_interface._cfg_cache, "metrics", None)
+    system_info = {"wifi": ("Connected", "status-ok", "10.0.0.2"), "uptime": (1, 5), "memory": 120.5}
+    header, body = web_interface.handle_root_page((21.5, 40.0), system_info, None)
+    assert header == web_interface.H_200_HTML
+    html = render(body)
+    assert "Temp: 21.5C | Humidity: 40.0%" in html
+    assert "Uptime: 01:05 | Memory: 120.5KB" in html
+    assert html.endswith("</body></html>")
+
+
+def test_handle_health_check_fills_template(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(web_interface._cfg_cache, "metrics", None)
+    system_info = {
+        "wifi": ("Connected", "status-ok", "10.0.0.2"),
+        "uptime_detailed": (2, 3, 4),
+        "memory_detailed": (123456, 120.6, "status-ok"),
+    }
+    header, body = web_interface.handle_health_check((21.5, 40.0), system_info, None, "home")
+    assert header == web_interface.H_200_HTML
+    html = render(body)
+    assert "<strong>Humidity:</strong> 40.0%<br>" in html
+    assert "<strong>Uptime:</strong> 2d 03:04" in html
+    assert "123,456 bytes (120.6KB)" in html
+    assert "<strong>SSID:</strong> home" in html
+    assert html.endswith("</body></html>")
+
+
+def test_get_request_length():
+    get_request_length = web_interface.get_request_length
+    assert get_request_length(b"GET / HTTP/1.1\r\nHost: pico\r\n\r\n") == 30
+    request = b"POST /config HTTP/1.1\r\nContent-Length: 5\r\n\r\n"
+    assert get_request_length(request + b"a=1") == len(request) + 5
+    assert get_request_length(b"POST /config HTTP/1.1\r\ncontent-length: 0\r\n\r\n") == 44
+    assert get_request_length(b"GET / HTTP/1.1\r\nHost: pico\r\n") == -1
+    assert get_request_length(b"POST / HTTP/1.1\r\nContent-Length: x\r\n\r\n") == -1
+    assert get_request_length(b"POST / HTTP/1.1\r\nContent-Length: -3\r\n\r\n") == -1
+
+
+def test_accepts_gzip_reads_accept_encoding_only(monkeypatch):
+    monkeypatch.setattr(web_interface, "deflate", object())
+    accepts = web_interface._accepts_gzip
+    assert accepts(b"GET /logs HTTP/1.1\r\nAccept-Encoding: deflate, gzip\r\n\r\n")
+    assert accepts(b"GET /logs HTTP/1.1\r\naccept-encoding: GZIP;q=0.5\r\n\r\n")
+    assert accepts(b"GET /logs HTTP/1.1\r\nAccept-Encoding: *\r\n\r\n")
+    assert not accepts(b"GET /logs HTTP/1.1\r\nAccept-Encoding: gzip;q=0\r\n\r\n")
+    assert not accepts(b"GET /logs HTTP/1.1\r\nAccept-Encoding: gzip; q=0.000, *\r\n\r\n")
+    assert not accepts(b"GET /logs HTTP/1.1\r\nUser-Agent: gzip-client\r\nReferer: /gzip\r\n\r\n")
+    assert not accepts(b"GET /logs HTTP/1.1\r\nAccept-Encoding: identity\r\n\r\nbody gzip")